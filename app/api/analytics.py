@@ -1,51 +1,39 @@
-from datetime import datetime
+from fastapi import APIRouter, Depends, Request
 
-from fastapi import APIRouter, Depends, Header, HTTPException
-
-from app.config import Settings
-from app.dependencies import get_db_session, get_settings, get_trade_analytics, get_risk_manager
-from app.services.analytics import TradeAnalytics
+from app.dependencies import get_db_session, get_trade_analytics, get_risk_manager, verify_api_key
+from app.services.analytics import TradeAnalytics, analytics_cache
 from app.services.ibkr_client import IBKRClient
 from app.services.risk_manager import RiskManager
 from app.dependencies import get_ibkr_client
-from app.models.schemas import AnalyticsResponse, CooldownStatusResponse
+from app.models.schemas import AnalyticsQuery, AnalyticsResponse, CooldownStatusResponse
 
-router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"], dependencies=[Depends(verify_api_key)])
 
 
 @router.get("", response_model=AnalyticsResponse)
 async def get_analytics(
-    from_date: str | None = None,
-    to_date: str | None = None,
-    instrument: str | None = None,
-    conviction: str | None = None,
-    strategy: str | None = None,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
-    db_session=Depends(get_db_session),
+    request: Request,
+    q: AnalyticsQuery = Depends(),
     analytics: TradeAnalytics = Depends(get_trade_analytics),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
-    from_dt = datetime.fromisoformat(from_date) if from_date else None
-    to_dt = datetime.fromisoformat(to_date) if to_date else None
-
-    result = await analytics.calculate(db_session, from_dt, to_dt, instrument, conviction, strategy)
+    # Concurrent polls with the same filters share one calculation. It can outlive
+    # the request that started it, so it opens its own session rather than using
+    # the dependency one.
+    async def _calculate():
+        async with request.app.state.async_session() as session:
+            return await analytics.calculate(session, q.from_date, q.to_date, q.instrument, q.conviction, q.strategy)
+
+    cache_key = (q.from_date, q.to_date, q.instrument, q.conviction, q.strategy)
+    result = await analytics_cache.get_or_compute(cache_key, _calculate)
     return AnalyticsResponse(**result)
 
 
 @router.get("/cooldown", response_model=CooldownStatusResponse)
 async def get_cooldown_status(
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     db_session=Depends(get_db_session),
     risk_manager: RiskManager = Depends(get_risk_manager),
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     try:
         account_info = await ibkr_client.get_account_info()
         balance = account_info.get("NetLiquidation", 10000.0)
@@ -1,27 +1,34 @@
-from fastapi import APIRouter, Depends, Header, HTTPException
+import asyncio
+import functools
+from concurrent.futures import Executor
+
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.config import Settings
-from app.dependencies import get_settings
+from app.dependencies import get_backtest_pool, get_settings, verify_api_key
 from app.models.schemas import BacktestRequest, BacktestResponse
 from app.services.backtester import Backtester
 from app.services.macro_data import MacroDataService
 
-router = APIRouter(prefix="/api/v1/backtest", tags=["backtest"])
+router = APIRouter(prefix="/api/v1/backtest", tags=["backtest"], dependencies=[Depends(verify_api_key)])
 
 
 @router.post("", response_model=BacktestResponse)
 async def run_backtest(
     request: BacktestRequest,
-    x_api_key: str = Header(...),
+    backtest_pool: Executor | None = Depends(get_backtest_pool),
     settings: Settings = Depends(get_settings),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
-    backtester = Backtester()
+    backtester = Backtester(
+        cache_dir=settings.backtest_cache_dir or None,
+        cache_ttl_seconds=settings.backtest_cache_ttl_seconds,
+    )
     macro_service = MacroDataService() if request.strategy == "krabbe_scored" else None
 
-    result = backtester.run(
+    # Backtests are CPU-bound — run them off the event loop so other requests
+    # on this worker aren't starved while one is in progress.
+    run = functools.partial(
+        backtester.run,
         instrument_key=request.instrument,
         strategy=request.strategy,
         period=request.period,
@@ -36,6 +43,7 @@ async def run_backtest(
         end_date=request.end_date,
         max_trades=request.max_trades,
     )
+    result = await asyncio.get_running_loop().run_in_executor(backtest_pool, run)
 
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
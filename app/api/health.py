@@ -1,22 +1,36 @@
-from fastapi import APIRouter
+import json
+
+from fastapi import APIRouter, Request, Response
 
 from app.instruments import INSTRUMENTS
+from app.utils.http_cache import etag_matches, make_etag
 
 router = APIRouter(tags=["health"])
 
-
-@router.get("/health")
-async def health():
-    return {
+# Instrument registry is static — build the payload once at import time
+_INSTRUMENTS_PAYLOAD = [
+    {
+        "key": spec.key,
+        "name": spec.display_name,
+        "sec_type": spec.sec_type,
+        "exchange": spec.exchange,
+    }
+    for spec in INSTRUMENTS.values()
+]
+_HEALTH_ETAG = make_etag(_INSTRUMENTS_PAYLOAD)
+# ...and serialize it once too, so probes don't pay for JSON encoding
+_HEALTH_BYTES = json.dumps(
+    {
         "status": "ok",
         "service": "trader-bot",
-        "instruments": [
-            {
-                "key": spec.key,
-                "name": spec.display_name,
-                "sec_type": spec.sec_type,
-                "exchange": spec.exchange,
-            }
-            for spec in INSTRUMENTS.values()
-        ],
-    }
+        "instruments": _INSTRUMENTS_PAYLOAD,
+    },
+    separators=(",", ":"),
+).encode()
+
+
+@router.get("/health")
+async def health(request: Request):
+    if etag_matches(request, _HEALTH_ETAG):
+        return Response(status_code=304, headers={"ETag": _HEALTH_ETAG})
+    return Response(content=_HEALTH_BYTES, media_type="application/json", headers={"ETag": _HEALTH_ETAG})
@@ -1,29 +1,22 @@
 """Journal API endpoints for recording and querying AI analyses."""
 
-import json
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
-from fastapi import APIRouter, Depends, Header, HTTPException
-
-from app.config import Settings
-from app.dependencies import get_db_session, get_settings, get_journal_service
-from app.models.schemas import JournalCreateRequest, JournalResponse, JournalStatsResponse
+from app.dependencies import get_db_session, get_journal_service, verify_api_key
+from app.models.schemas import JournalCreateRequest, JournalQuery, JournalResponse, JournalStatsResponse
 from app.services.journal import JournalService
+from app.utils.http_cache import etag_matches, make_etag
 
-router = APIRouter(prefix="/api/v1/journal", tags=["journal"])
+router = APIRouter(prefix="/api/v1/journal", tags=["journal"], dependencies=[Depends(verify_api_key)])
 
 
 @router.post("", response_model=JournalResponse)
 async def create_journal_entry(
     request: JournalCreateRequest,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     db_session=Depends(get_db_session),
     journal_service: JournalService = Depends(get_journal_service),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     data = request.model_dump()
     entry = await journal_service.record_analysis(db_session, data)
     return _entry_to_response(entry)
@@ -31,34 +24,36 @@ async def create_journal_entry(
 
 @router.get("", response_model=list[JournalResponse])
 async def list_journal_entries(
-    from_date: str | None = None,
-    to_date: str | None = None,
-    instrument: str | None = None,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
+    request: Request,
+    q: JournalQuery = Depends(),
     db_session=Depends(get_db_session),
     journal_service: JournalService = Depends(get_journal_service),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
-    from_dt = datetime.fromisoformat(from_date) if from_date else None
-    to_dt = datetime.fromisoformat(to_date) if to_date else None
-
-    entries = await journal_service.get_journal(db_session, from_dt, to_dt, instrument)
-    return [_entry_to_response(e) for e in entries]
+    # Short-circuit with 304 if nothing matching the filters changed
+    version = await journal_service.get_journal_version(db_session, q.from_date, q.to_date, q.instrument)
+    etag = make_etag(version)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Stream the JSON array row by row. The generator runs after this handler
+    # returns, so it opens its own session rather than using the dependency one.
+    async def _stream_entries():
+        async with request.app.state.async_session() as session:
+            yield b"["
+            separator = b""
+            async for entry in journal_service.stream_journal(session, q.from_date, q.to_date, q.instrument):
+                yield separator + _entry_to_response(entry).model_dump_json().encode()
+                separator = b","
+            yield b"]"
+
+    return StreamingResponse(_stream_entries(), media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/stats", response_model=JournalStatsResponse)
 async def get_journal_stats(
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     db_session=Depends(get_db_session),
     journal_service: JournalService = Depends(get_journal_service),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     stats = await journal_service.get_journal_stats(db_session)
     return JournalStatsResponse(**stats)
 
@@ -69,14 +64,9 @@ async def update_journal_entry(
     outcome: str | None = None,
     outcome_notes: str | None = None,
     linked_trade_id: int | None = None,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     db_session=Depends(get_db_session),
     journal_service: JournalService = Depends(get_journal_service),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     entry = None
     if linked_trade_id is not None:
         entry = await journal_service.link_trade(db_session, journal_id, linked_trade_id)
@@ -91,19 +81,19 @@ async def update_journal_entry(
 
 
 def _entry_to_response(entry) -> JournalResponse:
-    """Convert an AnalysisJournal ORM object to a response model."""
-    factors = json.loads(entry.factors) if entry.factors else {}
-    trade_idea = json.loads(entry.trade_idea) if entry.trade_idea else None
+    """Convert an AnalysisJournal ORM object to a response model.
 
-    return JournalResponse(
+    Rows come from our own table, so validation is skipped via model_construct.
+    """
+    return JournalResponse.model_construct(
         id=entry.id,
         instrument=entry.instrument,
         direction=entry.direction,
         conviction=entry.conviction,
         total_score=entry.total_score,
-        factors=factors,
+        factors=entry.factors or {},
         reasoning=entry.reasoning,
-        trade_idea=trade_idea,
+        trade_idea=entry.trade_idea or None,
         source=entry.source,
         linked_trade_id=entry.linked_trade_id,
         outcome=entry.outcome,
@@ -1,13 +1,15 @@
+import asyncio
 import logging
 import os
+from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db_session, get_ibkr_client, get_icm_client, get_settings
+from app.dependencies import get_db_session, get_ibkr_client, get_icm_client, get_telegram_notifier, verify_api_key
 from app.instruments import get_instrument, INSTRUMENTS
 from app.models.schemas import (
     ClosePositionRequest,
@@ -17,6 +19,7 @@ from app.models.schemas import (
     TradeStatusResponse,
 )
 from app.models.trade import Trade, TradeStatus
+from app.services.analytics import analytics_cache
 from app.services.ibkr_client import IBKRClient
 from app.services.icmarkets_client import ICMarketsClient
 from app.services.telegram_notifier import TelegramNotifier
@@ -31,20 +34,38 @@ def _get_broker_for_instrument(instrument_key: str, ibkr_client, icm_client):
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/positions", tags=["positions"])
+router = APIRouter(prefix="/api/v1/positions", tags=["positions"], dependencies=[Depends(verify_api_key)])
+
+
+async def _get_position_price(instrument_key: str, ibkr_client, icm_client) -> dict:
+    """Fetch the current price for a position from the broker that holds it."""
+    broker = _get_broker_for_instrument(instrument_key, ibkr_client, icm_client)
+    return await broker.get_price(instrument_key)
+
+
+def _summarize_pending_order(po: dict) -> dict:
+    """Flatten a pending parent order and its SL/TP children into one entry."""
+    children = po.get("children", ())
+    return {
+        "orderId": po["orderId"],
+        "instrument": po["instrument"],
+        "direction": po["action"],
+        "size": po["totalQuantity"],
+        "order_type": "LIMIT" if po["orderType"] == "LMT" else "STOP",
+        "entry_price": po["entryPrice"],
+        "status": po["status"],
+        # Last STP child is the SL; first LMT child is the TP
+        "stop_loss": next((c["auxPrice"] for c in reversed(children) if c["orderType"] == "STP"), None),
+        "take_profit": next((c["lmtPrice"] for c in children if c["orderType"] == "LMT"), None),
+    }
 
 
 @router.get("/")
 async def get_positions(
-    x_api_key: str = Header(...),
     instrument: str | None = Query(None, description="Filter by instrument key"),
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     icm_client: ICMarketsClient = Depends(get_icm_client),
-    settings=Depends(get_settings),
-):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
+) -> dict:
     if instrument:
         broker = _get_broker_for_instrument(instrument, ibkr_client, icm_client)
         positions = await broker.get_open_positions(instrument_key=instrument)
@@ -66,13 +87,9 @@ async def get_positions(
 
 @router.get("/account")
 async def get_account(
-    x_api_key: str = Header(...),
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     icm_client: ICMarketsClient = Depends(get_icm_client),
-    settings=Depends(get_settings),
-):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
+) -> dict:
     account = {}
     if ibkr_client._connected:
         try:
@@ -93,15 +110,12 @@ async def get_account(
 @router.post("/close", response_model=ClosePositionResponse)
 async def close_position(
     request: ClosePositionRequest,
-    x_api_key: str = Header(...),
+    background_tasks: BackgroundTasks,
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     icm_client: ICMarketsClient = Depends(get_icm_client),
     db_session: AsyncSession = Depends(get_db_session),
-    settings=Depends(get_settings),
+    notifier: TelegramNotifier = Depends(get_telegram_notifier),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     instrument = get_instrument(request.instrument)
     broker = _get_broker_for_instrument(instrument.key, ibkr_client, icm_client)
 
@@ -140,34 +154,41 @@ async def close_position(
             else:
                 pnl = (position["avg_cost"] - close_price) * close_size * instrument.multiplier
 
-        # Update the most recent executed trade for this direction + instrument
-        stmt = (
-            select(Trade)
+        # Close the most recent executed trade for this direction + instrument
+        latest_executed_id = (
+            select(Trade.id)
             .where(Trade.direction == request.direction)
             .where(Trade.epic == instrument.key)
             .where(Trade.status == TradeStatus.EXECUTED)
             .order_by(Trade.id.desc())
             .limit(1)
+            .scalar_subquery()
         )
-        result_row = await db_session.execute(stmt)
-        trade = result_row.scalar_one_or_none()
-        if trade:
-            trade.status = TradeStatus.CLOSED
-            trade.pnl = pnl
-            trade.closed_at = datetime.now(timezone.utc)
+        stmt = (
+            update(Trade)
+            .where(Trade.id == latest_executed_id)
+            .values(status=TradeStatus.CLOSED, pnl=pnl, closed_at=datetime.now(timezone.utc))
+            .returning(Trade.id)
+            .execution_options(synchronize_session=False)
+        )
+        closed_trade_id = (await db_session.execute(stmt)).scalar_one_or_none()
+        # Nothing to commit if no executed trade matched
+        if closed_trade_id is not None:
             await db_session.commit()
+            analytics_cache.clear()
+            logger.info("Closed trade #%d (%s %s)", closed_trade_id, instrument.key, request.direction)
 
         # Clean up ratchet state file for this position
         ratchet_file = Path(os.environ.get("JOURNAL_DIR", "/app/journal")) / "monitors" / f"ratchet_{instrument.key}_{request.direction}.json"
         ratchet_file.unlink(missing_ok=True)
 
-        # Notify via Telegram
-        notifier = TelegramNotifier(settings)
+        # Notify via Telegram after the response is sent
         pnl_str = f"{pnl:+.2f}€" if pnl is not None else "N/A"
         tick = instrument.tick_size
         decimals = max(2, len(f"{tick:.10f}".rstrip("0").split(".")[1]))
         cp_str = f"{close_price:.{decimals}f}" if close_price else "N/A"
-        await notifier.send_message(
+        background_tasks.add_task(
+            notifier.send_message,
             f"Position CLOSED — {instrument.display_name}\n"
             f"Direction: {request.direction}\n"
             f"Size: {close_size} {instrument.size_unit}\n"
@@ -196,15 +217,12 @@ async def close_position(
 @router.post("/modify", response_model=ModifyPositionResponse)
 async def modify_position(
     request: ModifyPositionRequest,
-    x_api_key: str = Header(...),
+    background_tasks: BackgroundTasks,
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     icm_client: ICMarketsClient = Depends(get_icm_client),
     db_session: AsyncSession = Depends(get_db_session),
-    settings=Depends(get_settings),
+    notifier: TelegramNotifier = Depends(get_telegram_notifier),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     if request.new_stop_loss is None and request.new_take_profit is None and request.new_sl_quantity is None:
         raise HTTPException(
             status_code=400,
@@ -239,16 +257,17 @@ async def modify_position(
     )
     result_row = await db_session.execute(stmt)
     trade = result_row.scalar_one_or_none()
-    if trade:
+    # A quantity-only modify leaves the trade row untouched — skip the commit
+    if trade and (request.new_stop_loss is not None or request.new_take_profit is not None):
         if request.new_stop_loss is not None:
             trade.stop_loss = request.new_stop_loss
         if request.new_take_profit is not None:
             trade.take_profit = request.new_take_profit
         await db_session.commit()
 
-    # Telegram notification
-    notifier = TelegramNotifier(settings)
-    await notifier.send_modify_update(
+    # Telegram notification after the response is sent
+    background_tasks.add_task(
+        notifier.send_modify_update,
         instrument=instrument,
         direction=request.direction,
         old_sl=result["old_sl"],
@@ -273,74 +292,73 @@ async def modify_position(
 
 @router.get("/status", response_model=TradeStatusResponse)
 async def get_trade_status(
-    x_api_key: str = Header(...),
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     icm_client: ICMarketsClient = Depends(get_icm_client),
     db_session: AsyncSession = Depends(get_db_session),
-    settings=Depends(get_settings),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     positions = []
     open_orders = []
     account = {}
     pending_orders_raw = []
 
-    if ibkr_client._connected:
-        try:
-            positions = await ibkr_client.get_open_positions()
-            open_orders = await ibkr_client.get_open_orders()
-            account = await ibkr_client.get_account_info()
-            pending_orders_raw = await ibkr_client.get_pending_orders()
-        except Exception:
-            pass
+    # Fetch IBKR and IC Markets state concurrently
+    ibkr_calls = (
+        [
+            ibkr_client.get_open_positions(),
+            ibkr_client.get_open_orders(),
+            ibkr_client.get_account_info(),
+            ibkr_client.get_pending_orders(),
+        ]
+        if ibkr_client._connected
+        else []
+    )
+    results = await asyncio.gather(
+        *ibkr_calls,
+        icm_client.get_open_positions(),
+        icm_client.get_pending_orders(),
+        icm_client.get_account_info(),
+        return_exceptions=True,
+    )
+    if ibkr_calls:
+        ibkr_positions, ibkr_orders, ibkr_account, ibkr_pending = results[:4]
+        if not isinstance(ibkr_positions, Exception):
+            positions = ibkr_positions
+        if not isinstance(ibkr_orders, Exception):
+            open_orders = ibkr_orders
+        if not isinstance(ibkr_account, Exception):
+            account = ibkr_account
+        if not isinstance(ibkr_pending, Exception):
+            pending_orders_raw = ibkr_pending
+    icm_positions, icm_pending, icm_account = results[len(ibkr_calls):]
 
     # Aggregate IC Markets positions + orders
-    try:
-        icm_positions = await icm_client.get_open_positions()
+    if not isinstance(icm_positions, Exception):
         positions.extend(icm_positions)
-    except Exception:
-        pass
-    try:
-        icm_pending = await icm_client.get_pending_orders()
+    if not isinstance(icm_pending, Exception):
         pending_orders_raw.extend(icm_pending)
-    except Exception:
-        pass
-    try:
-        icm_account = await icm_client.get_account_info()
+    if not isinstance(icm_account, Exception):
         if not account:
             account = icm_account
         else:
             account["icm"] = icm_account
-    except Exception:
-        pass
 
     # Build pending orders section with SL/TP from children
-    pending_orders = []
-    for po in pending_orders_raw:
-        entry = {
-            "orderId": po["orderId"],
-            "instrument": po["instrument"],
-            "direction": po["action"],
-            "size": po["totalQuantity"],
-            "order_type": "LIMIT" if po["orderType"] == "LMT" else "STOP",
-            "entry_price": po["entryPrice"],
-            "status": po["status"],
-            "stop_loss": None,
-            "take_profit": None,
-        }
-        for child in po.get("children", []):
-            if child["orderType"] == "STP":
-                entry["stop_loss"] = child["auxPrice"]
-            elif child["orderType"] == "LMT":
-                # Pick the first LMT as TP (or last if multiple)
-                if entry["take_profit"] is None:
-                    entry["take_profit"] = child["lmtPrice"]
-        pending_orders.append(entry)
+    pending_orders = [_summarize_pending_order(po) for po in pending_orders_raw]
+
+    # Fetch current prices for all positions concurrently
+    prices = await asyncio.gather(
+        *[_get_position_price(pos["instrument"], ibkr_client, icm_client) for pos in positions],
+        return_exceptions=True,
+    )
+
+    # Index child (SL/TP) orders by (instrument, action) for O(1) lookup per position
+    child_orders: dict[tuple[str, str], list[dict]] = defaultdict(list)
+    for order in open_orders:
+        if order["parentId"] > 0:
+            child_orders[(order["instrument"], order["action"])].append(order)
 
     # Enrich each position with SL/TP from open orders and unrealized P&L
-    for pos in positions:
+    for pos, price_data in zip(positions, prices):
         instrument_key = pos["instrument"]
         direction = pos["direction"]
         reverse = "SELL" if direction == "BUY" else "BUY"
@@ -348,22 +366,18 @@ async def get_trade_status(
         # Find SL (STP) and TP (LMT) child orders for this position
         pos["stop_loss"] = None
         pos["take_profit"] = None
-        for order in open_orders:
-            if (
-                order["instrument"] == instrument_key
-                and order["parentId"] > 0
-                and order["action"] == reverse
-            ):
-                if order["orderType"] == "STP":
-                    pos["stop_loss"] = order["auxPrice"]
-                elif order["orderType"] == "LMT":
-                    pos["take_profit"] = order["lmtPrice"]
+        for order in child_orders.get((instrument_key, reverse), ()):
+            if order["orderType"] == "STP":
+                pos["stop_loss"] = order["auxPrice"]
+            elif order["orderType"] == "LMT":
+                pos["take_profit"] = order["lmtPrice"]
 
         # Calculate unrealized P&L using current price (converted to EUR)
+        if isinstance(price_data, Exception):
+            logger.warning("Could not fetch price for %s", instrument_key)
+            continue
         try:
             spec = get_instrument(instrument_key)
-            pos_broker = _get_broker_for_instrument(instrument_key, ibkr_client, icm_client)
-            price_data = await pos_broker.get_price(instrument_key)
             current_price = price_data.get("last") or price_data.get("bid") or 0
             if current_price and pos["avg_cost"]:
                 if direction == "BUY":
@@ -1,38 +1,27 @@
 """Technical analysis API endpoints."""
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from app.config import Settings
-from app.dependencies import get_settings, get_technical_analyzer
+from app.dependencies import get_technical_analyzer, verify_api_key
 from app.services.technical_analyzer import TechnicalAnalyzer
 
-router = APIRouter(prefix="/api/v1/technicals", tags=["technicals"])
+router = APIRouter(prefix="/api/v1/technicals", tags=["technicals"], dependencies=[Depends(verify_api_key)])
 
 
 @router.get("/scan")
 async def scan_all(
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """Scan all instruments and return ranked by score."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     return await analyzer.scan_all()
 
 
 @router.get("/{instrument}")
 async def analyze_instrument(
     instrument: str,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """Full multi-timeframe analysis for a single instrument."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     result = await analyzer.analyze(instrument)
     if "error" in result and "available" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -43,14 +32,9 @@ async def analyze_instrument(
 @router.get("/{instrument}/m5scalp")
 async def analyze_instrument_m5_scalp(
     instrument: str,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """M5 scalp analysis using H1 trend gate and M5 entry signals."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     result = await analyzer.analyze_m5_scalp(instrument)
     if "error" in result and "available" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -61,14 +45,9 @@ async def analyze_instrument_m5_scalp(
 @router.get("/{instrument}/nyorb")
 async def analyze_instrument_ny_orb(
     instrument: str,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """NY Opening Range Breakout analysis on M5 data."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     result = await analyzer.analyze_ny_orb(instrument)
     if "error" in result and "available" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -79,14 +58,9 @@ async def analyze_instrument_ny_orb(
 @router.get("/{instrument}/m15sensei")
 async def analyze_instrument_m15_sensei(
     instrument: str,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """M15 Sensei analysis using W/M patterns with trend and RSI filters."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     result = await analyzer.analyze_m15_sensei(instrument)
     if "error" in result and "available" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -97,14 +71,9 @@ async def analyze_instrument_m15_sensei(
 @router.get("/{instrument}/m15bb")
 async def analyze_instrument_m15_bb_bounce(
     instrument: str,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """M15 Bollinger Band Bounce analysis for range-bound markets."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     result = await analyzer.analyze_m15_bb_bounce(instrument)
     if "error" in result and "available" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -115,14 +84,9 @@ async def analyze_instrument_m15_bb_bounce(
 @router.get("/{instrument}/intraday")
 async def analyze_instrument_intraday(
     instrument: str,
-    x_api_key: str = Header(...),
-    settings: Settings = Depends(get_settings),
     analyzer: TechnicalAnalyzer = Depends(get_technical_analyzer),
-):
+) -> dict:
     """Intraday/scalp analysis using 1H and 15m timeframes."""
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     result = await analyzer.analyze_intraday(instrument)
     if "error" in result and "available" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -6,15 +6,16 @@ on every request when a secret_token is provided during setWebhook.
 
 import hmac
 
-from fastapi import APIRouter, Request, Response
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Request, Response
 
 router = APIRouter(tags=["telegram"])
 
 
 @router.post("/webhook/telegram")
-async def telegram_webhook(request: Request):
+async def telegram_webhook(request: Request, background_tasks: BackgroundTasks):
     """Process incoming Telegram update via webhook."""
-    handler = getattr(request.app.state, "telegram_handler", None)
+    handler = request.app.state.telegram_handler
     if handler is None:
         return Response(status_code=503)
 
@@ -25,6 +26,8 @@ async def telegram_webhook(request: Request):
         if not hmac.compare_digest(token, expected):
             return Response(status_code=403)
 
-    data = await request.json()
-    await handler.process_update(data)
+    data = orjson.loads(await request.body())
+    # Ack immediately — Telegram retries updates that aren't answered within a
+    # few seconds, and /status or /pnl can take that long querying the brokers
+    background_tasks.add_task(handler.process_update, data)
     return Response(status_code=200)
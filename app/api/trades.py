@@ -1,10 +1,17 @@
+import asyncio
 import logging
 
-from fastapi import APIRouter, Depends, Header, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db_session, get_ibkr_client, get_settings, get_trade_executor
+from app.dependencies import (
+    get_db_session,
+    get_ibkr_client,
+    get_telegram_notifier,
+    get_trade_executor,
+    verify_api_key,
+)
 from app.instruments import get_instrument
 from app.models.schemas import (
     CancelOrderRequest,
@@ -19,32 +26,25 @@ from app.services.trade_executor import TradeExecutor
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/trades", tags=["trades"])
+router = APIRouter(prefix="/api/v1/trades", tags=["trades"], dependencies=[Depends(verify_api_key)])
 
 
 @router.post("/submit", response_model=TradeSubmitResponse)
 async def submit_trade(
     request: TradeSubmitRequest,
-    x_api_key: str = Header(...),
     executor: TradeExecutor = Depends(get_trade_executor),
-    settings=Depends(get_settings),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
     return await executor.submit_trade(request)
 
 
 @router.post("/cancel", response_model=CancelOrderResponse)
 async def cancel_order(
     request: CancelOrderRequest,
-    x_api_key: str = Header(...),
+    background_tasks: BackgroundTasks,
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     db_session: AsyncSession = Depends(get_db_session),
-    settings=Depends(get_settings),
+    notifier: TelegramNotifier = Depends(get_telegram_notifier),
 ):
-    if x_api_key != settings.api_secret_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     instrument = get_instrument(request.instrument)
     cancelled_ids: list[int] = []
 
@@ -63,31 +63,33 @@ async def cancel_order(
                 status_code=404,
                 detail=f"No pending {request.direction} order found for {instrument.display_name}",
             )
-        for order in matching:
-            result = await ibkr_client.cancel_order(order["orderId"])
-            if result["success"]:
+        results = await asyncio.gather(
+            *(ibkr_client.cancel_order(order["orderId"]) for order in matching),
+            return_exceptions=True,
+        )
+        for order, result in zip(matching, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to cancel order %s: %s", order["orderId"], result)
+            elif result["success"]:
                 cancelled_ids.append(order["orderId"])
 
     if not cancelled_ids:
         raise HTTPException(status_code=500, detail="Failed to cancel any orders")
 
-    # Update DB records for cancelled orders
-    for order_id in cancelled_ids:
-        stmt = (
-            select(Trade)
-            .where(Trade.deal_id == str(order_id))
-            .where(Trade.status == TradeStatus.PENDING_ORDER)
-            .limit(1)
-        )
-        result_row = await db_session.execute(stmt)
-        trade = result_row.scalar_one_or_none()
-        if trade:
-            trade.status = TradeStatus.CANCELLED
+    # Update DB records for cancelled orders in one statement
+    stmt = (
+        update(Trade)
+        .where(Trade.deal_id.in_([str(order_id) for order_id in cancelled_ids]))
+        .where(Trade.status == TradeStatus.PENDING_ORDER)
+        .values(status=TradeStatus.CANCELLED)
+        .execution_options(synchronize_session=False)
+    )
+    await db_session.execute(stmt)
     await db_session.commit()
 
-    # Notify via Telegram
-    notifier = TelegramNotifier(settings)
-    await notifier.send_cancel_update(
+    # Notify via Telegram after the response is sent
+    background_tasks.add_task(
+        notifier.send_cancel_update,
         instrument=instrument,
         direction=request.direction,
         cancelled_order_ids=cancelled_ids,
@@ -1,3 +1,5 @@
+from functools import cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -21,6 +23,15 @@ class Settings(BaseSettings):
     atr_tp_multiplier: float = 2.0
     atr_cache_ttl_seconds: int = 3600
 
+    # Backtest price-history cache ("" disables it)
+    backtest_cache_dir: str = "~/.cache/openclawgold/yf"
+    backtest_cache_ttl_seconds: int = 21600
+    # Backtest worker processes; kept small, the host also runs the IBKR link and scanners
+    backtest_workers: int = 1
+
+    # Economic calendar cache persisted across restarts ("" disables it)
+    calendar_cache_path: str = "~/.cache/openclawgold/calendar.json"
+
     # Partial take-profit
     partial_tp_enabled: bool = True
     partial_tp_percent: float = 50.0
@@ -92,6 +103,14 @@ class Settings(BaseSettings):
     # App
     api_secret_key: str
     database_url: str = "sqlite+aiosqlite:///./trades.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
     log_level: str = "INFO"
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
+
+
+@cache
+def load_settings() -> Settings:
+    """Return the process-wide Settings, parsing the environment and .env only once."""
+    return Settings()
@@ -1,4 +1,8 @@
-from fastapi import Depends, Request
+import hmac
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from fastapi import Depends, Header, HTTPException, Request
 
 from app.config import Settings
 from app.services.atr_calculator import ATRCalculator
@@ -15,10 +19,39 @@ from app.services.journal import JournalService
 from app.services.technical_analyzer import TechnicalAnalyzer
 
 
+@dataclass
+class ServiceRegistry:
+    """Request-independent services, built once at startup and shared by all requests."""
+
+    session_filter: SessionFilter
+    validator: TradeValidator
+    sizer: PositionSizer
+    risk_manager: RiskManager
+
+    @classmethod
+    def build(cls, settings: Settings) -> "ServiceRegistry":
+        session_filter = SessionFilter(settings)
+        return cls(
+            session_filter=session_filter,
+            validator=TradeValidator(settings, session_filter=session_filter),
+            sizer=PositionSizer(settings),
+            risk_manager=RiskManager(settings),
+        )
+
+
 def get_settings(request: Request) -> Settings:
     return request.app.state.settings
 
 
+async def verify_api_key(
+    x_api_key: str = Header(...),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    """Reject requests whose X-API-Key header doesn't match the configured secret."""
+    if not hmac.compare_digest(x_api_key, settings.api_secret_key):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+
 def get_ibkr_client(request: Request) -> IBKRClient:
     return request.app.state.ibkr_client
 
@@ -31,33 +64,41 @@ def get_atr_calculator(request: Request) -> ATRCalculator:
     return request.app.state.atr_calculator
 
 
+def get_services(request: Request) -> ServiceRegistry:
+    return request.app.state.services
+
+
+def get_telegram_notifier(request: Request) -> TelegramNotifier:
+    return request.app.state.telegram_notifier
+
+
+def get_backtest_pool(request: Request) -> Executor | None:
+    return request.app.state.backtest_pool
+
+
 async def get_db_session(request: Request):
     async with request.app.state.async_session() as session:
         yield session
 
 
 def get_trade_executor(
-    request: Request,
     settings: Settings = Depends(get_settings),
+    services: ServiceRegistry = Depends(get_services),
     ibkr_client: IBKRClient = Depends(get_ibkr_client),
     icm_client: ICMarketsClient = Depends(get_icm_client),
     atr_calculator: ATRCalculator = Depends(get_atr_calculator),
+    notifier: TelegramNotifier = Depends(get_telegram_notifier),
     db_session=Depends(get_db_session),
 ) -> TradeExecutor:
-    session_filter = SessionFilter(settings)
-    validator = TradeValidator(settings, session_filter=session_filter)
-    sizer = PositionSizer(settings)
-    notifier = TelegramNotifier(settings)
-    risk_manager = RiskManager(settings)
     return TradeExecutor(
         ibkr_client=ibkr_client,
         icm_client=icm_client,
-        validator=validator,
-        sizer=sizer,
+        validator=services.validator,
+        sizer=services.sizer,
         db_session=db_session,
         notifier=notifier,
         settings=settings,
-        risk_manager=risk_manager,
+        risk_manager=services.risk_manager,
         atr_calculator=atr_calculator,
     )
 
@@ -67,9 +108,9 @@ def get_trade_analytics() -> TradeAnalytics:
 
 
 def get_risk_manager(
-    settings: Settings = Depends(get_settings),
+    services: ServiceRegistry = Depends(get_services),
 ) -> RiskManager:
-    return RiskManager(settings)
+    return services.risk_manager
 
 
 def get_journal_service() -> JournalService:
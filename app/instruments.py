@@ -1,15 +1,29 @@
 from dataclasses import dataclass, field
 from datetime import date, timedelta
+from functools import lru_cache
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TradingSession:
     name: str
     start_hour_utc: int  # 0-23
     end_hour_utc: int    # 0-23 (exclusive), wraps past midnight if end < start
 
+    @property
+    def hours_mask(self) -> int:
+        """24-bit mask with bit h set for every UTC hour h inside the session."""
+        start_bits = (1 << self.start_hour_utc) - 1
+        end_bits = (1 << self.end_hour_utc) - 1
+        if self.start_hour_utc <= self.end_hour_utc:
+            return end_bits ^ start_bits
+        # Wraps past midnight (e.g., 22-06)
+        return (_ALL_HOURS_MASK ^ start_bits) | end_bits
 
-@dataclass(frozen=True)
+
+_ALL_HOURS_MASK = (1 << 24) - 1
+
+
+@dataclass(frozen=True, slots=True)
 class InstrumentSpec:
     key: str
     symbol: str
@@ -33,6 +47,18 @@ class InstrumentSpec:
     tick_size: float = 0.01  # minimum price increment for this contract
     swing_strategy: str = "krabbe_scored"  # "krabbe_scored" or "rsi_reversal"
     broker: str = "ibkr"  # "ibkr" or "icmarkets"
+    # Union of all trading_sessions as a 24-bit UTC hour mask (derived)
+    session_hours_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        mask = 0
+        for session in self.trading_sessions:
+            mask |= session.hours_mask
+        object.__setattr__(self, "session_hours_mask", mask)
+
+    def in_session_hour(self, hour: int) -> bool:
+        """True if the UTC hour falls inside any of the instrument's trading sessions."""
+        return bool((self.session_hours_mask >> hour) & 1)
 
 
 INSTRUMENTS: dict[str, InstrumentSpec] = {
@@ -278,10 +304,20 @@ INSTRUMENTS: dict[str, InstrumentSpec] = {
 }
 
 
+# Canonical and lowercase keys, so the common spellings skip normalization
+_LOOKUP: dict[str, InstrumentSpec] = {
+    **INSTRUMENTS,
+    **{k.lower(): v for k, v in INSTRUMENTS.items()},
+}
+
+
 def get_instrument(key: str | None) -> InstrumentSpec:
     """Look up an instrument by key. Defaults to XAUUSD if key is None."""
     if key is None:
         return INSTRUMENTS["XAUUSD"]
+    spec = _LOOKUP.get(key)
+    if spec is not None:
+        return spec
     normalized = key.upper().strip()
     if normalized not in INSTRUMENTS:
         raise ValueError(f"Unknown instrument: {key!r}. Available: {list(INSTRUMENTS)}")
@@ -305,18 +341,25 @@ def build_ibkr_contract(spec: InstrumentSpec):
     return Contract(**kwargs)
 
 
+_CYCLE_MONTHS = {
+    "H": 3, "M": 6, "U": 9, "Z": 12,
+    "F": 1, "G": 2, "J": 4, "K": 5,
+    "N": 7, "Q": 8, "V": 10, "X": 11,
+}
+
+
 def get_next_futures_expiry(spec: InstrumentSpec) -> str:
     """Return YYYYMM for the next futures contract month in the cycle."""
     if not spec.future_cycle:
         raise ValueError(f"{spec.key} has no future_cycle defined")
+    # The answer only changes once a day, so memoize per (cycle, day)
+    return _next_expiry_for_cycle(spec.future_cycle, date.today().toordinal())
 
-    cycle_months = {
-        "H": 3, "M": 6, "U": 9, "Z": 12,
-        "F": 1, "G": 2, "J": 4, "K": 5,
-        "N": 7, "Q": 8, "V": 10, "X": 11,
-    }
-    months_in_cycle = sorted(cycle_months[c] for c in spec.future_cycle)
-    today = date.today()
+
+@lru_cache(maxsize=64)
+def _next_expiry_for_cycle(future_cycle: str, today_ordinal: int) -> str:
+    months_in_cycle = sorted(_CYCLE_MONTHS[c] for c in future_cycle)
+    today = date.fromordinal(today_ordinal)
     # Find next expiry month (with buffer: if within 5 days of month end, roll)
     rollover_date = today + timedelta(days=5)
 
@@ -1,15 +1,18 @@
 import asyncio
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import FastAPI
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from app.config import Settings
+from app.config import Settings, load_settings
+from app.dependencies import ServiceRegistry
 from app.instruments import INSTRUMENTS
-from app.models.database import Base
+from app.models.database import Base, create_engine, create_session_factory
 from app.models.trade import Trade, TradeStatus
 from app.services.atr_calculator import ATRCalculator
 from app.services.ibkr_client import IBKRClient
@@ -24,7 +27,7 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    settings = Settings()
+    settings = load_settings()
 
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper(), logging.INFO),
@@ -32,11 +35,15 @@ async def lifespan(app: FastAPI):
     )
 
     # Database
-    engine = create_async_engine(settings.database_url, echo=False)
+    engine = create_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     app.state.engine = engine
-    app.state.async_session = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.async_session = create_session_factory(engine)
 
     # IBKR Client — only connect if icm is not the sole broker
     ibkr_client = IBKRClient(settings)
@@ -58,8 +65,20 @@ async def lifespan(app: FastAPI):
 
     app.state.ibkr_client = ibkr_client
     app.state.settings = settings
-    app.state.atr_calculator = ATRCalculator(settings)
-    app.state.technical_analyzer = TechnicalAnalyzer()
+    app.state.services = ServiceRegistry.build(settings)
+    atr_calculator = ATRCalculator(settings)
+    app.state.atr_calculator = atr_calculator
+    # Warm every instrument's ATR with one batched download instead of N cold fetches
+    atr_warmup_task = asyncio.create_task(
+        asyncio.to_thread(atr_calculator.prefetch, list(INSTRUMENTS.values()))
+    )
+    technical_analyzer = TechnicalAnalyzer()
+    technical_analyzer.start()
+    app.state.technical_analyzer = technical_analyzer
+    backtest_pool = create_backtest_pool(settings)
+    app.state.backtest_pool = backtest_pool
+    notifier = TelegramNotifier(settings)
+    app.state.telegram_notifier = notifier
 
     # IC Markets Client (cTrader)
     icm_client = ICMarketsClient(settings)
@@ -77,7 +96,6 @@ async def lifespan(app: FastAPI):
     # Trade close monitor (background task)
     monitor_task = None
     if app.state.ibkr_connected or app.state.icm_connected:
-        notifier = TelegramNotifier(settings)
         monitor = TradeCloseMonitor(
             ibkr_client=ibkr_client,
             icm_client=icm_client,
@@ -96,10 +114,10 @@ async def lifespan(app: FastAPI):
     )
     try:
         await telegram_handler.start()
-        app.state.telegram_handler = telegram_handler
     except Exception:
         logger.exception("Failed to start Telegram command handler")
         telegram_handler = None
+    app.state.telegram_handler = telegram_handler
 
     # Reconcile orphaned positions on startup
     await _reconcile_positions(
@@ -128,12 +146,28 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    atr_warmup_task.cancel()
+    backtest_pool.shutdown(wait=False, cancel_futures=True)
+    await technical_analyzer.aclose()
     await ibkr_client.disconnect()
     await icm_client.disconnect()
     await engine.dispose()
     logger.info("Trader Bot shut down")
 
 
+def create_backtest_pool(settings: Settings) -> ProcessPoolExecutor:
+    """Process pool for CPU-bound backtests.
+
+    Workers are spawned rather than forked: by the time the first backtest runs
+    the app is multi-threaded (ATR warmup, aiosqlite, executor threads), and a
+    forked child can inherit locks held by those threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=settings.backtest_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
 async def _reconcile_positions(
     ibkr_client: IBKRClient,
     icm_client: ICMarketsClient,
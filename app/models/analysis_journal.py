@@ -1,12 +1,17 @@
 """Analysis journal model for recording AI analyses and forward-testing."""
 
 import enum
+from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
 from app.models.database import Base
 
+# JSON text on SQLite (compatible with rows written as json.dumps TEXT), JSONB on PostgreSQL
+JSONColumn = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 
 class AnalysisJournal(Base):
     __tablename__ = "analysis_journal"
@@ -16,11 +21,13 @@ class AnalysisJournal(Base):
     direction = Column(String, nullable=False)  # BUY, SELL, NO_TRADE
     conviction = Column(String, nullable=True)  # HIGH, MEDIUM, LOW
     total_score = Column(Float, nullable=False)
-    factors = Column(Text, nullable=True)  # JSON-serialized dict of all factor scores
+    factors = Column(JSONColumn, nullable=True)  # dict of all factor scores
     reasoning = Column(Text, nullable=True)
-    trade_idea = Column(Text, nullable=True)  # JSON: {stop_distance, limit_distance, entry_price}
+    trade_idea = Column(JSONColumn, nullable=True)  # {stop_distance, limit_distance, entry_price}
     source = Column(String, default="krabbe")
     linked_trade_id = Column(Integer, ForeignKey("trades.id"), nullable=True)
     outcome = Column(String, nullable=True)  # WIN, LOSS, SKIPPED, PENDING
     outcome_notes = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
+    # Python-side timestamp (microsecond resolution) — part of the GET /journal ETag
+    updated_at = Column(DateTime, onupdate=lambda: datetime.now(timezone.utc))
@@ -1,3 +1,5 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -6,8 +8,42 @@ class Base(DeclarativeBase):
     pass
 
 
-def create_engine(database_url: str):
-    return create_async_engine(database_url, echo=False)
+# Compiled-SQL LRU size (SQLAlchemy default is 500). Most statements are built
+# inline per call, so a larger cache keeps them from being evicted and recompiled.
+QUERY_CACHE_SIZE = 1200
+
+
+def create_engine(database_url: str, pool_size: int = 20, max_overflow: int = 30):
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single StaticPool connection — no pool tuning applies
+        return create_async_engine(database_url, echo=False, query_cache_size=QUERY_CACHE_SIZE)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    engine = create_async_engine(
+        database_url,
+        echo=False,
+        query_cache_size=QUERY_CACHE_SIZE,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_use_lifo=True,  # reuse the most recently returned (warm) connection
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        # Wait for a competing writer instead of failing with "database is locked"
+        connect_args={"timeout": 30} if is_sqlite else {},
+    )
+    if is_sqlite:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets the trade monitor's reads run alongside API writes; NORMAL sync is safe under WAL."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
 
 
 def create_session_factory(engine) -> async_sessionmaker[AsyncSession]:
@@ -1,27 +1,44 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.trade import TradeStatus
 
+# Shared choice types — validated by a literal set lookup rather than a regex match
+Direction = Literal["BUY", "SELL"]
+Conviction = Literal["HIGH", "MEDIUM", "LOW"]
+OrderType = Literal["MARKET", "LIMIT", "STOP"]
+BacktestStrategy = Literal[
+    "sma_crossover", "rsi_reversal", "breakout", "krabbe_scored", "m5_scalp", "m15_sensei", "ny_orb",
+    "intraday_pure_atr", "intraday_relaxed_rr", "intraday_atr_capped_sr", "intraday_hybrid",
+]
+BacktestPeriod = Literal["5d", "60d", "6mo", "1y", "2y", "5y"]
+
+
+class ResponseModel(BaseModel):
+    """Base for response-only schemas: built once per request and never mutated."""
+
+    model_config = ConfigDict(frozen=True)
+
 
 class TradeSubmitRequest(BaseModel):
-    direction: str = Field(..., pattern="^(BUY|SELL)$")
+    direction: Direction
     instrument: str | None = None
     size: float | None = None
     stop_distance: float | None = None
     limit_distance: float | None = None
     stop_level: float | None = None
     limit_level: float | None = None
-    conviction: str | None = Field(None, pattern="^(HIGH|MEDIUM|LOW)$")
+    conviction: Conviction | None = None
     source: str = "manual"
     reasoning: str | None = None
-    order_type: str | None = Field("MARKET", pattern="^(MARKET|LIMIT|STOP)$")
+    order_type: OrderType | None = "MARKET"
     entry_price: float | None = None
     strategy: str | None = None
 
 
-class TradeSubmitResponse(BaseModel):
+class TradeSubmitResponse(ResponseModel):
     trade_id: int
     deal_id: str | None
     instrument: str
@@ -40,11 +57,11 @@ class TradeSubmitResponse(BaseModel):
 
 class CancelOrderRequest(BaseModel):
     instrument: str | None = None
-    direction: str = Field(..., pattern="^(BUY|SELL)$")
+    direction: Direction
     order_id: int | None = None
 
 
-class CancelOrderResponse(BaseModel):
+class CancelOrderResponse(ResponseModel):
     status: str
     instrument: str
     direction: str
@@ -52,7 +69,7 @@ class CancelOrderResponse(BaseModel):
     message: str
 
 
-class PositionResponse(BaseModel):
+class PositionResponse(ResponseModel):
     deal_id: str
     direction: str
     size: float
@@ -63,13 +80,13 @@ class PositionResponse(BaseModel):
 
 
 class ClosePositionRequest(BaseModel):
-    direction: str = Field(..., pattern="^(BUY|SELL)$", description="Direction of the position to close")
+    direction: Direction = Field(..., description="Direction of the position to close")
     instrument: str | None = None
     size: float | None = Field(None, description="Size to close (omit to close full position)")
     reasoning: str | None = None
 
 
-class ClosePositionResponse(BaseModel):
+class ClosePositionResponse(ResponseModel):
     status: str
     instrument: str
     direction: str
@@ -81,14 +98,14 @@ class ClosePositionResponse(BaseModel):
 
 class ModifyPositionRequest(BaseModel):
     instrument: str | None = None
-    direction: str = Field(..., pattern="^(BUY|SELL)$")
+    direction: Direction
     new_stop_loss: float | None = None
     new_take_profit: float | None = None
     new_sl_quantity: float | None = None
     reasoning: str | None = None
 
 
-class ModifyPositionResponse(BaseModel):
+class ModifyPositionResponse(ResponseModel):
     status: str
     instrument: str
     direction: str
@@ -99,7 +116,7 @@ class ModifyPositionResponse(BaseModel):
     message: str
 
 
-class TradeStatusResponse(BaseModel):
+class TradeStatusResponse(ResponseModel):
     positions: list[dict]
     pending_orders: list[dict] = []
     open_orders: list[dict]
@@ -107,7 +124,7 @@ class TradeStatusResponse(BaseModel):
     recent_trades: list[dict]
 
 
-class TradeHistoryItem(BaseModel):
+class TradeHistoryItem(ResponseModel):
     id: int
     deal_id: str | None
     direction: str
@@ -119,7 +136,15 @@ class TradeHistoryItem(BaseModel):
     closed_at: datetime | None
 
 
-class AnalyticsResponse(BaseModel):
+class AnalyticsQuery(BaseModel):
+    from_date: datetime | None = None
+    to_date: datetime | None = None
+    instrument: str | None = None
+    conviction: str | None = None
+    strategy: str | None = None
+
+
+class AnalyticsResponse(ResponseModel):
     total_trades: int = 0
     winning_trades: int = 0
     losing_trades: int = 0
@@ -143,7 +168,7 @@ class AnalyticsResponse(BaseModel):
     monthly_pnl: list[dict] = []
 
 
-class CooldownStatusResponse(BaseModel):
+class CooldownStatusResponse(ResponseModel):
     can_trade: bool
     cooldown_active: bool = False
     cooldown_reason: str | None = None
@@ -157,8 +182,8 @@ class CooldownStatusResponse(BaseModel):
 
 class BacktestRequest(BaseModel):
     instrument: str = "XAUUSD"
-    strategy: str = Field(..., pattern="^(sma_crossover|rsi_reversal|breakout|krabbe_scored|m5_scalp|m15_sensei|ny_orb|intraday_pure_atr|intraday_relaxed_rr|intraday_atr_capped_sr|intraday_hybrid)$")
-    period: str = Field("1y", pattern="^(5d|60d|6mo|1y|2y|5y)$")
+    strategy: BacktestStrategy
+    period: BacktestPeriod = "1y"
     start_date: str | None = None  # "YYYY-MM-DD" — overrides period if set
     end_date: str | None = None    # "YYYY-MM-DD" — overrides period if set
     max_trades: int | None = None  # Stop after N trades
@@ -170,7 +195,7 @@ class BacktestRequest(BaseModel):
     partial_tp: bool = True
 
 
-class BacktestResponse(BaseModel):
+class BacktestResponse(ResponseModel):
     instrument: str
     strategy: str
     period: str
@@ -191,8 +216,8 @@ class BacktestResponse(BaseModel):
 
 class JournalCreateRequest(BaseModel):
     instrument: str
-    direction: str = Field(..., pattern="^(BUY|SELL|NO_TRADE)$")
-    conviction: str | None = Field(None, pattern="^(HIGH|MEDIUM|LOW)$")
+    direction: Literal["BUY", "SELL", "NO_TRADE"]
+    conviction: Conviction | None = None
     total_score: float
     factors: dict = {}
     reasoning: str | None = None
@@ -200,7 +225,13 @@ class JournalCreateRequest(BaseModel):
     source: str = "krabbe"
 
 
-class JournalResponse(BaseModel):
+class JournalQuery(BaseModel):
+    from_date: datetime | None = None
+    to_date: datetime | None = None
+    instrument: str | None = None
+
+
+class JournalResponse(ResponseModel):
     id: int
     instrument: str
     direction: str
@@ -216,7 +247,7 @@ class JournalResponse(BaseModel):
     created_at: datetime | None = None
 
 
-class JournalStatsResponse(BaseModel):
+class JournalStatsResponse(ResponseModel):
     total_analyses: int = 0
     total_with_outcome: int = 0
     overall_win_rate: float = 0.0
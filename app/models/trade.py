@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum as SAEnum, Index
 from sqlalchemy.sql import func
 
 from app.models.database import Base
@@ -19,6 +19,13 @@ class TradeStatus(str, enum.Enum):
 
 class Trade(Base):
     __tablename__ = "trades"
+    __table_args__ = (
+        # "Most recent EXECUTED trade for epic + direction" lookup (close/modify)
+        Index("ix_trades_epic_direction_status_id", "epic", "direction", "status", "id"),
+        # Analytics: closed trades in a date range, optionally per instrument, ordered by closed_at
+        Index("ix_trades_status_closed_at", "status", "closed_at"),
+        Index("ix_trades_status_epic_closed_at", "status", "epic", "closed_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     deal_id = Column(String, nullable=True)
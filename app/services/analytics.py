@@ -1,14 +1,23 @@
 import logging
-from collections import defaultdict
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+import numpy as np
+import pandas as pd
+from sqlalchemy import Row, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.trade import Trade, TradeStatus
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Short-lived cache of GET /analytics results, keyed by filter args.
+# Cleared whenever a trade is marked CLOSED.
+analytics_cache = TTLCache(ttl_seconds=30)
+
+# Rows per chunk when streaming closed trades for the ordered metrics
+_STREAM_CHUNK = 1000
+
 
 class TradeAnalytics:
     """Full performance metrics from the Trade table."""
@@ -22,23 +31,32 @@ class TradeAnalytics:
         conviction: str | None = None,
         strategy: str | None = None,
     ) -> dict:
-        """Calculate full analytics from closed trades."""
-        trades = await self._fetch_trades(db_session, from_date, to_date, instrument, conviction, strategy)
-
-        if not trades:
+        """Calculate full analytics from closed trades.
+
+        Counts, sums and per-group breakdowns are aggregated in SQL; only the
+        columns needed for the ordered metrics (drawdown, streaks, R:R, time
+        buckets) are fetched row by row.
+        """
+        filters = self._filters(from_date, to_date, instrument, conviction, strategy)
+
+        totals = (await db_session.execute(
+            select(
+                func.count(),
+                func.count().filter(Trade.pnl > 0),
+                func.count().filter(Trade.pnl < 0),
+                func.coalesce(func.sum(case((Trade.pnl > 0, Trade.pnl))), 0.0),
+                func.coalesce(func.sum(case((Trade.pnl < 0, Trade.pnl))), 0.0),
+                func.coalesce(func.sum(Trade.pnl), 0.0),
+            ).where(*filters)
+        )).one()
+        total, win_count, loss_count, gross_profit, gross_loss_signed, total_pnl = totals
+
+        if not total:
             return self._empty_result()
 
-        wins = [t for t in trades if t.pnl is not None and t.pnl > 0]
-        losses = [t for t in trades if t.pnl is not None and t.pnl < 0]
-        breakevens = [t for t in trades if t.pnl is not None and t.pnl == 0]
-
-        total = len(trades)
-        win_count = len(wins)
-        loss_count = len(losses)
-
         win_rate = (win_count / total * 100) if total > 0 else 0.0
-        avg_win = sum(t.pnl for t in wins) / win_count if wins else 0.0
-        avg_loss = sum(t.pnl for t in losses) / loss_count if losses else 0.0
+        avg_win = gross_profit / win_count if win_count else 0.0
+        avg_loss = gross_loss_signed / loss_count if loss_count else 0.0
 
         # Expectancy = (win_rate * avg_win) + (loss_rate * avg_loss)
         win_pct = win_count / total if total > 0 else 0
@@ -46,34 +64,32 @@ class TradeAnalytics:
         expectancy = (win_pct * avg_win) + (loss_pct * avg_loss)
 
         # Profit factor = gross_profit / gross_loss
-        gross_profit = sum(t.pnl for t in wins) if wins else 0.0
-        gross_loss = abs(sum(t.pnl for t in losses)) if losses else 0.0
+        gross_loss = abs(gross_loss_signed)
         profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else float("inf") if gross_profit > 0 else 0.0
 
-        total_pnl = sum(t.pnl for t in trades if t.pnl is not None)
+        columns = await self._fetch_trade_columns(db_session, filters)
 
-        # Max drawdown
-        max_drawdown = self._calculate_max_drawdown(trades)
-
-        # Planned vs achieved R:R
-        planned_rr, achieved_rr = self._calculate_rr(trades)
-
-        # Streaks
-        current_streak, max_win_streak, max_loss_streak = self._calculate_streaks(trades)
+        # Drawdown, R:R, streaks and time buckets, vectorized over the columns
+        ordered = self._scan_ordered(columns)
+        max_drawdown = ordered["max_drawdown"]
+        planned_rr, achieved_rr = ordered["planned_rr"], ordered["achieved_rr"]
+        current_streak = ordered["current_streak"]
+        max_win_streak, max_loss_streak = ordered["max_win_streak"], ordered["max_loss_streak"]
 
         # Per-instrument breakdown
-        per_instrument = self._per_instrument_breakdown(trades)
-
-        # Time-based P&L
-        daily_pnl = self._time_pnl(trades, "day")
-        weekly_pnl = self._time_pnl(trades, "week")
-        monthly_pnl = self._time_pnl(trades, "month")
+        per_instrument = self._per_instrument_breakdown(
+            await self._group_counts(db_session, filters, Trade.epic)
+        )
 
         # Per-conviction breakdown
-        per_conviction = self._per_conviction_breakdown(trades)
+        per_conviction = self._per_group_breakdown(
+            await self._group_counts(db_session, filters, func.coalesce(Trade.conviction, "UNKNOWN"))
+        )
 
         # Per-strategy breakdown
-        per_strategy = self._per_strategy_breakdown(trades)
+        per_strategy = self._per_group_breakdown(
+            await self._group_counts(db_session, filters, func.coalesce(Trade.strategy, "unknown"))
+        )
 
         return {
             "total_trades": total,
@@ -94,189 +110,171 @@ class TradeAnalytics:
             "per_instrument": per_instrument,
             "per_conviction": per_conviction,
             "per_strategy": per_strategy,
-            "daily_pnl": daily_pnl,
-            "weekly_pnl": weekly_pnl,
-            "monthly_pnl": monthly_pnl,
+            "daily_pnl": ordered["daily_pnl"],
+            "weekly_pnl": ordered["weekly_pnl"],
+            "monthly_pnl": ordered["monthly_pnl"],
         }
 
-    async def _fetch_trades(
-        self,
-        db_session: AsyncSession,
+    @staticmethod
+    def _filters(
         from_date: datetime | None,
         to_date: datetime | None,
         instrument: str | None,
         conviction: str | None = None,
         strategy: str | None = None,
-    ) -> list[Trade]:
-        query = (
-            select(Trade)
-            .where(Trade.status == TradeStatus.CLOSED)
-            .where(Trade.pnl.isnot(None))
-        )
+    ) -> list:
+        filters = [Trade.status == TradeStatus.CLOSED, Trade.pnl.isnot(None)]
         if from_date:
-            query = query.where(Trade.closed_at >= from_date)
+            filters.append(Trade.closed_at >= from_date)
         if to_date:
-            query = query.where(Trade.closed_at <= to_date)
+            filters.append(Trade.closed_at <= to_date)
         if instrument:
-            query = query.where(Trade.epic == instrument.upper())
+            filters.append(Trade.epic == instrument.upper())
         if conviction:
-            query = query.where(Trade.conviction == conviction.upper())
+            filters.append(Trade.conviction == conviction.upper())
         if strategy:
-            query = query.where(Trade.strategy == strategy)
-        query = query.order_by(Trade.closed_at.asc())
+            filters.append(Trade.strategy == strategy)
+        return filters
+
+    async def _fetch_trade_columns(self, db_session: AsyncSession, filters: list) -> list[list]:
+        """Fetch only the columns the ordered metrics need, oldest close first.
 
+        Rows are streamed in chunks of ``_STREAM_CHUNK`` and appended straight
+        into per-column lists, so the full result set is never held as Row
+        objects (by the driver or here).
+        """
+        query = (
+            select(Trade.pnl, Trade.closed_at, Trade.stop_distance, Trade.limit_distance, Trade.size)
+            .where(*filters)
+            .order_by(Trade.closed_at.asc())
+            .execution_options(yield_per=_STREAM_CHUNK)
+        )
+        columns: list[list] = [[], [], [], [], []]
+        result = await db_session.stream(query)
+        async for partition in result.partitions():
+            for column, values in zip(columns, zip(*partition)):
+                column.extend(values)
+        return columns
+
+    async def _group_counts(self, db_session: AsyncSession, filters: list, key) -> list[Row]:
+        """(key, total, wins, losses, pnl) per group, aggregated in SQL."""
+        query = (
+            select(
+                key.label("key"),
+                func.count().label("total"),
+                func.count().filter(Trade.pnl > 0).label("wins"),
+                func.count().filter(Trade.pnl < 0).label("losses"),
+                func.coalesce(func.sum(Trade.pnl), 0.0).label("pnl"),
+            )
+            .where(*filters)
+            .group_by(key)
+        )
         result = await db_session.execute(query)
-        return list(result.scalars().all())
-
-    def _calculate_max_drawdown(self, trades: list[Trade]) -> float:
-        """Calculate max drawdown from equity curve."""
-        if not trades:
-            return 0.0
-
-        equity = 0.0
-        peak = 0.0
-        max_dd = 0.0
-
-        for t in trades:
-            if t.pnl is not None:
-                equity += t.pnl
-                if equity > peak:
-                    peak = equity
-                dd = peak - equity
-                if dd > max_dd:
-                    max_dd = dd
-
-        return max_dd
-
-    def _calculate_rr(self, trades: list[Trade]) -> tuple[float | None, float | None]:
-        """Calculate planned vs achieved risk:reward ratios."""
-        planned_rrs = []
-        achieved_rrs = []
-
-        for t in trades:
-            if t.stop_distance and t.limit_distance and t.stop_distance > 0:
-                planned_rrs.append(t.limit_distance / t.stop_distance)
-            if t.pnl is not None and t.stop_distance and t.stop_distance > 0 and t.size and t.size > 0:
-                risk_amount = t.stop_distance * t.size
-                if risk_amount > 0:
-                    achieved_rrs.append(t.pnl / risk_amount)
-
-        planned = sum(planned_rrs) / len(planned_rrs) if planned_rrs else None
-        achieved = sum(achieved_rrs) / len(achieved_rrs) if achieved_rrs else None
-        return planned, achieved
-
-    def _calculate_streaks(self, trades: list[Trade]) -> tuple[int, int, int]:
-        """Calculate current streak, max win streak, max loss streak."""
-        if not trades:
-            return 0, 0, 0
-
-        current = 0
-        max_win = 0
-        max_loss = 0
-        win_streak = 0
-        loss_streak = 0
-
-        for t in trades:
-            if t.pnl is not None and t.pnl > 0:
-                win_streak += 1
-                loss_streak = 0
-                max_win = max(max_win, win_streak)
-            elif t.pnl is not None and t.pnl < 0:
-                loss_streak += 1
-                win_streak = 0
-                max_loss = max(max_loss, loss_streak)
-            else:
-                win_streak = 0
-                loss_streak = 0
-
-        # Current streak: positive = wins, negative = losses
-        if win_streak > 0:
-            current = win_streak
-        elif loss_streak > 0:
-            current = -loss_streak
-
-        return current, max_win, max_loss
-
-    def _per_instrument_breakdown(self, trades: list[Trade]) -> dict[str, dict]:
-        """Group metrics by instrument."""
-        by_instrument: dict[str, list[Trade]] = defaultdict(list)
-        for t in trades:
-            by_instrument[t.epic].append(t)
-
-        result = {}
-        for instrument, inst_trades in by_instrument.items():
-            wins = [t for t in inst_trades if t.pnl and t.pnl > 0]
-            losses = [t for t in inst_trades if t.pnl and t.pnl < 0]
-            total = len(inst_trades)
-            result[instrument] = {
-                "total_trades": total,
-                "winning_trades": len(wins),
-                "losing_trades": len(losses),
-                "win_rate": round(len(wins) / total * 100, 2) if total > 0 else 0,
-                "total_pnl": round(sum(t.pnl for t in inst_trades if t.pnl), 2),
-                "avg_pnl": round(sum(t.pnl for t in inst_trades if t.pnl) / total, 2) if total > 0 else 0,
-            }
-        return result
-
-    def _per_conviction_breakdown(self, trades: list[Trade]) -> dict[str, dict]:
-        """Group metrics by conviction level (HIGH, MEDIUM, LOW)."""
-        by_conviction: dict[str, list[Trade]] = defaultdict(list)
-        for t in trades:
-            conv = t.conviction or "UNKNOWN"
-            by_conviction[conv].append(t)
-
-        result = {}
-        for conv, conv_trades in by_conviction.items():
-            wins = [t for t in conv_trades if t.pnl and t.pnl > 0]
-            total = len(conv_trades)
-            result[conv] = {
-                "total_trades": total,
-                "winning_trades": len(wins),
-                "win_rate": round(len(wins) / total * 100, 2) if total > 0 else 0,
-                "total_pnl": round(sum(t.pnl for t in conv_trades if t.pnl), 2),
+        return list(result.all())
+
+    def _scan_ordered(self, columns: list[list]) -> dict:
+        """Equity drawdown, R:R averages, win/loss streaks and day/week/month P&L.
+
+        Columns are (pnl, closed_at, stop_distance, limit_distance, size),
+        ordered by closed_at, with a non-null pnl (see _filters).
+        They are converted to NumPy arrays once and every metric is computed
+        vectorized rather than in a per-row Python loop.
+        """
+        pnl_col, closed_col, stop_col, limit_col, size_col = columns
+        n = len(pnl_col)
+        if n == 0:
+            return {
+                "max_drawdown": 0.0, "planned_rr": None, "achieved_rr": None,
+                "current_streak": 0, "max_win_streak": 0, "max_loss_streak": 0,
+                "daily_pnl": [], "weekly_pnl": [], "monthly_pnl": [],
             }
-        return result
-
-    def _per_strategy_breakdown(self, trades: list[Trade]) -> dict[str, dict]:
-        """Group metrics by strategy (intraday, swing, m5_scalp)."""
-        by_strategy: dict[str, list[Trade]] = defaultdict(list)
-        for t in trades:
-            strat = t.strategy or "unknown"
-            by_strategy[strat].append(t)
-
-        result = {}
-        for strat, strat_trades in by_strategy.items():
-            wins = [t for t in strat_trades if t.pnl and t.pnl > 0]
-            total = len(strat_trades)
-            result[strat] = {
-                "total_trades": total,
-                "winning_trades": len(wins),
-                "win_rate": round(len(wins) / total * 100, 2) if total > 0 else 0,
-                "total_pnl": round(sum(t.pnl for t in strat_trades if t.pnl), 2),
-            }
-        return result
-
-    def _time_pnl(self, trades: list[Trade], period: str) -> list[dict]:
-        """Aggregate P&L by day/week/month."""
-        grouped: dict[str, float] = defaultdict(float)
-
-        for t in trades:
-            if t.pnl is None or t.closed_at is None:
-                continue
-            dt = t.closed_at
-            if period == "day":
-                key = dt.strftime("%Y-%m-%d")
-            elif period == "week":
-                key = f"{dt.isocalendar()[0]}-W{dt.isocalendar()[1]:02d}"
-            else:  # month
-                key = dt.strftime("%Y-%m")
-            grouped[key] += t.pnl
 
+        pnl = np.array(pnl_col, dtype=np.float64)
+        stop = np.array(stop_col, dtype=np.float64)
+        limit = np.array(limit_col, dtype=np.float64)
+        size = np.array(size_col, dtype=np.float64)
+
+        # Equity curve / drawdown (peak starts at 0 — the account's opening equity)
+        equity = np.cumsum(pnl)
+        peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+        max_dd = float(max((peak - equity).max(), 0.0))
+
+        # Planned vs achieved R:R (NaN comparisons are False, so NULLs drop out)
+        has_stop = stop > 0
+        planned = has_stop & (limit != 0) & ~np.isnan(limit)
+        achieved = has_stop & (size > 0)
+        planned_rr = float((limit[planned] / stop[planned]).mean()) if planned.any() else None
+        achieved_rr = (
+            float((pnl[achieved] / (stop[achieved] * size[achieved])).mean()) if achieved.any() else None
+        )
+
+        # Streaks: run-length encode the sign of each trade's P&L
+        sign = np.sign(pnl).astype(np.int8)
+        run_starts = np.concatenate(([0], np.flatnonzero(np.diff(sign)) + 1))
+        run_lengths = np.diff(np.append(run_starts, n))
+        run_signs = sign[run_starts]
+        max_win = int(run_lengths[run_signs > 0].max(initial=0))
+        max_loss = int(run_lengths[run_signs < 0].max(initial=0))
+        current = int(run_lengths[-1]) * int(run_signs[-1])
+
+        # Time buckets
+        closed = pd.DatetimeIndex(closed_col)
+        series = pd.Series(pnl, index=closed)[closed.notna()]
+        idx = series.index
+        # Group on numeric periods and only format the distinct keys, not every row
+        iso = idx.isocalendar()
+        daily = series.groupby(idx.to_period("D")).sum()
+        weekly = series.groupby([iso["year"].to_numpy(), iso["week"].to_numpy()]).sum()
+        monthly = series.groupby(idx.to_period("M")).sum()
+        daily.index = daily.index.strftime("%Y-%m-%d")
+        weekly.index = [f"{year}-W{week:02d}" for year, week in weekly.index]
+        monthly.index = monthly.index.strftime("%Y-%m")
+
+        return {
+            "max_drawdown": max_dd,
+            "planned_rr": planned_rr,
+            "achieved_rr": achieved_rr,
+            "current_streak": current,
+            "max_win_streak": max_win,
+            "max_loss_streak": max_loss,
+            "daily_pnl": self._format_buckets(daily),
+            "weekly_pnl": self._format_buckets(weekly),
+            "monthly_pnl": self._format_buckets(monthly),
+        }
+
+    @staticmethod
+    def _format_buckets(grouped: pd.Series) -> list[dict]:
         return [
-            {"period": k, "pnl": round(v, 2)}
-            for k, v in sorted(grouped.items())
+            {"period": k, "pnl": round(float(v), 2)}
+            for k, v in grouped.items()
         ]
 
+    def _per_instrument_breakdown(self, groups: list[Row]) -> dict[str, dict]:
+        """Format per-instrument group counts."""
+        return {
+            g.key: {
+                "total_trades": g.total,
+                "winning_trades": g.wins,
+                "losing_trades": g.losses,
+                "win_rate": round(g.wins / g.total * 100, 2) if g.total > 0 else 0,
+                "total_pnl": round(g.pnl, 2),
+                "avg_pnl": round(g.pnl / g.total, 2) if g.total > 0 else 0,
+            }
+            for g in groups
+        }
+
+    def _per_group_breakdown(self, groups: list[Row]) -> dict[str, dict]:
+        """Format per-conviction (HIGH, MEDIUM, LOW) or per-strategy group counts."""
+        return {
+            g.key: {
+                "total_trades": g.total,
+                "winning_trades": g.wins,
+                "win_rate": round(g.wins / g.total * 100, 2) if g.total > 0 else 0,
+                "total_pnl": round(g.pnl, 2),
+            }
+            for g in groups
+        }
+
     def _empty_result(self) -> dict:
         return {
             "total_trades": 0,
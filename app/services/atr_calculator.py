@@ -1,6 +1,10 @@
 import logging
+import threading
 import time
+from concurrent.futures import Future
 
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
 from app.config import Settings
@@ -15,6 +19,8 @@ class ATRCalculator:
     def __init__(self, settings: Settings):
         self.settings = settings
         self._cache: dict[str, tuple[float, float]] = {}  # key -> (atr, timestamp)
+        self._inflight: dict[str, Future] = {}  # key -> fetch in progress
+        self._lock = threading.Lock()
 
     def get_dynamic_sl_tp(
         self, instrument: InstrumentSpec
@@ -45,25 +51,98 @@ class ATRCalculator:
         return sl, tp
 
     def _get_atr(self, instrument: InstrumentSpec) -> float | None:
-        """Fetch ATR with caching (monotonic clock)."""
-        now = time.monotonic()
-        cached = self._cache.get(instrument.key)
-        if cached:
-            atr_val, ts = cached
-            if now - ts < self.settings.atr_cache_ttl_seconds:
-                return atr_val
-
-        atr = self._fetch_atr(instrument)
-        if atr is not None:
-            self._cache[instrument.key] = (atr, now)
+        """Fetch ATR with caching (monotonic clock).
+
+        Concurrent callers that miss the cache for the same instrument share a
+        single yfinance fetch instead of each starting their own.
+        """
+        with self._lock:
+            cached = self._cache.get(instrument.key)
+            if cached:
+                atr_val, ts = cached
+                if time.monotonic() - ts < self.settings.atr_cache_ttl_seconds:
+                    return atr_val
+            future = self._inflight.get(instrument.key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[instrument.key] = future
+
+        if not owner:
+            return future.result()
+
+        atr = None
+        try:
+            atr = self._fetch_atr(instrument)
+            if atr is not None:
+                with self._lock:
+                    self._cache[instrument.key] = (atr, time.monotonic())
+        finally:
+            with self._lock:
+                del self._inflight[instrument.key]
+            future.set_result(atr)
         return atr
 
+    def prefetch(self, instruments: list[InstrumentSpec]) -> int:
+        """Warm the ATR cache for several instruments with one batched yfinance download.
+
+        Returns the number of instruments whose ATR was cached.
+        """
+        if not self.settings.atr_enabled or not instruments:
+            return 0
+
+        symbols = list(dict.fromkeys(inst.yahoo_symbol for inst in instruments))
+        try:
+            raw = yf.download(
+                symbols,
+                period="1mo",
+                interval="1d",
+                group_by="ticker",
+                progress=False,
+                threads=True,
+            )
+        except Exception as e:
+            logger.warning("ATR batch download failed: %s", e)
+            return 0
+        if raw is None or raw.empty:
+            return 0
+
+        now = time.monotonic()
+        warmed = 0
+        for inst in instruments:
+            try:
+                if isinstance(raw.columns, pd.MultiIndex):
+                    if inst.yahoo_symbol not in raw.columns.get_level_values(0):
+                        continue
+                    df = raw[inst.yahoo_symbol].dropna(how="all")
+                else:
+                    # Single ticker case
+                    df = raw
+            except (KeyError, TypeError):
+                logger.debug("Ticker %s not available in batch download", inst.yahoo_symbol)
+                continue
+            atr = self._compute_atr(inst, df)
+            if atr is not None:
+                with self._lock:
+                    self._cache[inst.key] = (atr, now)
+                warmed += 1
+        logger.info("ATR cache warmed for %d/%d instruments", warmed, len(instruments))
+        return warmed
+
     def _fetch_atr(self, instrument: InstrumentSpec) -> float | None:
         """Fetch daily OHLC from yfinance and compute ATR(period)."""
         try:
             ticker = yf.Ticker(instrument.yahoo_symbol)
             # Fetch enough data for ATR calculation
             df = ticker.history(period="1mo", interval="1d")
+        except Exception as e:
+            logger.warning("ATR fetch failed for %s: %s", instrument.key, e)
+            return None
+        return self._compute_atr(instrument, df)
+
+    def _compute_atr(self, instrument: InstrumentSpec, df: pd.DataFrame | None) -> float | None:
+        """Compute ATR(period) from a daily OHLC frame."""
+        try:
             if df is None or len(df) < self.settings.atr_period + 1:
                 logger.warning(
                     "%s: insufficient data for ATR(%d) — got %d bars",
@@ -73,23 +152,25 @@ class ATRCalculator:
                 return None
 
             # True Range = max(high-low, abs(high-prev_close), abs(low-prev_close))
-            high = df["High"]
-            low = df["Low"]
-            close = df["Close"]
-            prev_close = close.shift(1)
-
-            tr1 = high - low
-            tr2 = (high - prev_close).abs()
-            tr3 = (low - prev_close).abs()
-
-            import pandas as pd
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=self.settings.atr_period).mean().iloc[-1]
+            high = df["High"].to_numpy(dtype=float)
+            low = df["Low"].to_numpy(dtype=float)
+            close = df["Close"].to_numpy(dtype=float)
+            prev_close = np.empty_like(close)
+            prev_close[0] = np.nan
+            prev_close[1:] = close[:-1]
+
+            tr = np.maximum.reduce([
+                high - low,
+                np.abs(high - prev_close),
+                np.abs(low - prev_close),
+            ])
+            # Simple moving average of the last `atr_period` true ranges
+            atr = tr[-self.settings.atr_period:].mean()
 
             if atr is None or atr != atr:  # NaN check
                 return None
 
             return float(atr)
         except Exception as e:
-            logger.warning("ATR fetch failed for %s: %s", instrument.key, e)
+            logger.warning("ATR computation failed for %s: %s", instrument.key, e)
             return None
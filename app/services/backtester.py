@@ -1,7 +1,14 @@
+import hashlib
 import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
@@ -13,6 +20,15 @@ from app.services.scoring_engine import ScoringEngine
 
 logger = logging.getLogger(__name__)
 
+# Intraday bars keep printing during the session, so cached intraday history
+# goes stale much sooner than daily history.
+_INTRADAY_CACHE_TTL_SECONDS = 900
+
+# Indicator frames for recently seen daily history, keyed on a hash of the
+# data itself, so a sweep over risk parameters computes them once per worker.
+_INDICATOR_CACHE_SIZE = 32
+_indicator_cache: OrderedDict[int, pd.DataFrame] = OrderedDict()
+
 
 @dataclass
 class BacktestTrade:
@@ -29,6 +45,125 @@ class BacktestTrade:
     exit_reason: str  # "tp", "sl", "tp1_partial", "end_of_data"
 
 
+@dataclass(slots=True)
+class BacktestSignal:
+    index: int
+    direction: str
+    conviction: str
+    price: float
+    atr: float
+    score: float = 0.0
+    sl_dist: float | None = None  # per-signal overrides (intraday / NY ORB)
+    tp_dist: float | None = None
+    signal_type: str | None = None
+
+
+# Exit scan tuning: bars walked one at a time before switching to array
+# compares, and the first block size of the search (doubled each step).
+_SCAN_LOOP_BARS = 16
+_SCAN_BLOCK = 64
+
+
+def _reached(highs: np.ndarray, lows: np.ndarray, start: int, stop: int, is_buy: bool, level: float) -> bool:
+    """Whether price traded through ``level`` in the favourable direction on bars [start, stop)."""
+    if is_buy:
+        return bool((highs[start:stop] >= level).any())
+    return bool((lows[start:stop] <= level).any())
+
+
+def _scan_exit(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    start: int,
+    is_buy: bool,
+    entry_price: float,
+    sl_price: float,
+    tp_price: float,
+    sl_dist: float,
+    partial_tp: bool,
+    runner: bool,
+) -> tuple[int, float | None, str, float, bool]:
+    """Walk bars from ``start`` until the stop or target is hit.
+
+    SL is checked before TP within a bar. With ``partial_tp`` half the position
+    is taken off at 1R; in ``runner`` mode the stop then moves to breakeven and
+    trails 1R behind the best price instead of using a fixed TP.
+
+    Returns (exit_idx, exit_price, exit_reason, final_sl_price, partial_filled).
+    exit_price is None when no level was hit before the last bar.
+    """
+    n = len(highs)
+    partial_filled = False
+    peak_price = entry_price
+    tp1_price = entry_price + sl_dist if is_buy else entry_price - sl_dist  # 1R
+
+    # Most trades resolve within a few bars, where a plain loop is cheapest.
+    # With fixed levels, anything longer is finished by a block search below.
+    stop = n if runner else min(n, start + _SCAN_LOOP_BARS)
+    for j in range(start, stop):
+        if is_buy:
+            # Check SL (or trailing SL)
+            if lows[j] <= sl_price:
+                return j, sl_price, "trailing_sl" if partial_tp and partial_filled and runner else "sl", sl_price, partial_filled
+            # Check partial TP (at 1R)
+            if partial_tp and not partial_filled and highs[j] >= tp1_price:
+                partial_filled = True
+                if runner:
+                    # Move SL to breakeven, start trailing
+                    sl_price = entry_price
+                    peak_price = tp1_price
+            # Runner mode: trail SL at 1R behind peak
+            if runner and partial_tp and partial_filled:
+                peak_price = max(peak_price, highs[j])
+                trailing_sl = max(entry_price, peak_price - sl_dist)
+                if trailing_sl > sl_price:
+                    sl_price = trailing_sl
+            elif not runner and highs[j] >= tp_price:
+                # Fixed TP2
+                return j, tp_price, "tp", sl_price, partial_filled
+        else:  # SELL
+            if highs[j] >= sl_price:
+                return j, sl_price, "trailing_sl" if partial_tp and partial_filled and runner else "sl", sl_price, partial_filled
+            if partial_tp and not partial_filled and lows[j] <= tp1_price:
+                partial_filled = True
+                if runner:
+                    sl_price = entry_price
+                    peak_price = tp1_price
+            if runner and partial_tp and partial_filled:
+                peak_price = min(peak_price, lows[j])
+                trailing_sl = min(entry_price, peak_price + sl_dist)
+                if trailing_sl < sl_price:
+                    sl_price = trailing_sl
+            elif not runner and lows[j] <= tp_price:
+                return j, tp_price, "tp", sl_price, partial_filled
+
+    lo, block = stop, _SCAN_BLOCK
+    while lo < n:
+        hi = min(lo + block, n)
+        if is_buy:
+            sl_hit = lows[lo:hi] <= sl_price
+            hit = sl_hit | (highs[lo:hi] >= tp_price)
+        else:
+            sl_hit = highs[lo:hi] >= sl_price
+            hit = sl_hit | (lows[lo:hi] <= tp_price)
+        if hit.any():
+            k = int(hit.argmax())
+            j = lo + k
+            # SL wins a bar that touches both; the 1R level counts on any bar
+            # since the loop stopped (earlier blocks included), and on the exit
+            # bar only when that bar exits at TP (as in the loop above)
+            if sl_hit[k]:
+                partial_filled = partial_filled or (partial_tp and _reached(highs, lows, stop, j, is_buy, tp1_price))
+                return j, sl_price, "sl", sl_price, partial_filled
+            partial_filled = partial_filled or (partial_tp and _reached(highs, lows, stop, j + 1, is_buy, tp1_price))
+            return j, tp_price, "tp", sl_price, partial_filled
+        lo, block = hi, block * 2
+
+    if lo > stop:
+        partial_filled = partial_filled or (partial_tp and _reached(highs, lows, stop, n, is_buy, tp1_price))
+    return n - 1, None, "end_of_data", sl_price, partial_filled
+
+
 class Backtester:
     """Strategy backtester using historical OHLC data from yfinance."""
 
@@ -38,6 +173,11 @@ class Backtester:
         "GBP": "GBPUSD=X",   # GBPUSD — multiply PnL by this rate
     }
 
+    def __init__(self, cache_dir: str | None = None, cache_ttl_seconds: int = 21600):
+        # Optional on-disk cache of yfinance history (None = always download)
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.cache_ttl_seconds = cache_ttl_seconds
+
     def run(
         self,
         instrument_key: str,
@@ -106,7 +246,7 @@ class Backtester:
             signals = self._generate_signals(df, strategy)
 
         # Simulate trades
-        trades, equity_curve = self._simulate(
+        trades, eq_dates, eq_values = self._simulate(
             df, signals, instrument,
             initial_balance=initial_balance,
             risk_percent=risk_percent,
@@ -120,9 +260,31 @@ class Backtester:
 
         return self._compile_results(
             instrument_key, strategy, period,
-            initial_balance, trades, equity_curve,
+            initial_balance, trades, eq_dates, eq_values,
         )
 
+    def run_batch(self, configs: list[dict], executor: Executor | None = None) -> list[dict]:
+        """Run several backtests in parallel, one ``run(**config)`` per config.
+
+        Results come back in config order. A run that raises yields
+        ``{"error": ...}`` so one bad combination doesn't sink the sweep.
+        Without an executor, a process pool sized to the CPU count is used
+        for the duration of the call.
+        """
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                return self.run_batch(configs, executor=pool)
+
+        futures = [executor.submit(self.run, **config) for config in configs]
+        results = []
+        for config, future in zip(configs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("Backtest %s/%s failed: %s", config.get("instrument_key"), config.get("strategy"), e)
+                results.append({"error": str(e)})
+        return results
+
     def _run_m5_scalp_backtest(
         self,
         instrument_key: str,
@@ -162,7 +324,7 @@ class Backtester:
         signals = self._m5_scalp_signals(m5_df, h1_df)
 
         # Simulate with M5 ATR multipliers: SL 1.0×, runner mode (trail at 1R behind peak)
-        trades, equity_curve = self._simulate(
+        trades, eq_dates, eq_values = self._simulate(
             m5_df, signals, instrument,
             initial_balance=initial_balance,
             risk_percent=risk_percent,
@@ -177,12 +339,12 @@ class Backtester:
 
         return self._compile_results(
             instrument_key, "m5_scalp", period,
-            initial_balance, trades, equity_curve,
+            initial_balance, trades, eq_dates, eq_values,
         )
 
     def _m5_scalp_signals(
         self, m5_df: pd.DataFrame, h1_df: pd.DataFrame,
-    ) -> list[dict]:
+    ) -> list[BacktestSignal]:
         """Generate M5 scalp signals using M5ScalpScoringEngine."""
         engine = M5ScalpScoringEngine()
         signals = []
@@ -192,12 +354,17 @@ class Backtester:
         # Pre-compute H1 row lookup: map each M5 bar to nearest H1 bar
         h1_dates = h1_df.index if "date" not in h1_df.columns else h1_df["date"]
 
+        close = m5_df["close"].to_numpy(dtype=float)
+        atr = m5_df["atr"].to_numpy(dtype=float)
+        ready = ~(np.isnan(m5_df["ema9"].to_numpy(dtype=float)) | np.isnan(atr))
+        # Plain dict rows: the scoring engine only needs .get() on them
+        rows = m5_df.to_dict("records")
+
         warmup = 21  # Need EMA21 at minimum
         for i in range(warmup, len(m5_df)):
-            row = m5_df.iloc[i]
-
-            if pd.isna(row.get("ema9")) or pd.isna(row.get("atr")):
+            if not ready[i]:
                 continue
+            row = rows[i]
 
             # Find matching H1 row (latest H1 bar at or before this M5 bar)
             m5_date = m5_df.index[i] if "date" not in m5_df.columns else row.get("date")
@@ -219,11 +386,10 @@ class Backtester:
             # Pass bar timestamp for session quality scoring
             bar_date = row.get("date")
             bar_time = None
-            if bar_date is not None and hasattr(bar_date, "hour"):
+            if bar_date is not None:
                 bar_time = bar_date
                 if bar_time.tzinfo is None:
-                    from datetime import timezone as tz
-                    bar_time = bar_time.replace(tzinfo=tz.utc)
+                    bar_time = bar_time.replace(tzinfo=timezone.utc)
 
             result = engine.score(h1_row, m5_tail, trading_sessions=(), bar_time=bar_time)
 
@@ -237,14 +403,14 @@ class Backtester:
 
             conviction = result["conviction"] or "MEDIUM"
 
-            signals.append({
-                "index": i,
-                "direction": direction,
-                "conviction": conviction,
-                "price": row["close"],
-                "atr": row["atr"],
-                "score": result["total_score"],
-            })
+            signals.append(BacktestSignal(
+                index=i,
+                direction=direction,
+                conviction=conviction,
+                price=close[i],
+                atr=atr[i],
+                score=result["total_score"],
+            ))
 
             last_signal_idx = i
             last_signal_dir = direction
@@ -282,7 +448,7 @@ class Backtester:
         signals = self._ny_orb_signals(m5_df, instrument)
 
         # Simulate — use per-signal SL/TP (no ATR multiplier fallback)
-        trades, equity_curve = self._simulate(
+        trades, eq_dates, eq_values = self._simulate(
             m5_df, signals, instrument,
             initial_balance=initial_balance,
             risk_percent=risk_percent,
@@ -296,12 +462,12 @@ class Backtester:
 
         return self._compile_results(
             instrument_key, "ny_orb", period,
-            initial_balance, trades, equity_curve,
+            initial_balance, trades, eq_dates, eq_values,
         )
 
     def _ny_orb_signals(
         self, m5_df: pd.DataFrame, instrument: InstrumentSpec,
-    ) -> list[dict]:
+    ) -> list[BacktestSignal]:
         """Generate NY ORB signals: one breakout entry per day per direction."""
         engine = NYORBScoringEngine(tp_sl_ratio=2.0)
         signals = []
@@ -310,19 +476,23 @@ class Backtester:
         day_ranges: dict[str, dict] = {}  # date_str -> opening range
         day_signaled: dict[str, set] = {}  # date_str -> set of directions already signaled
 
+        close = m5_df["close"].to_numpy(dtype=float)
+        atr = m5_df["atr"].to_numpy(dtype=float)
+        has_atr = atr > 0  # NaN compares False
+        rows = m5_df.to_dict("records")
+
         warmup = 20  # Need ATR
 
         for i in range(warmup, len(m5_df)):
-            row = m5_df.iloc[i]
+            if not has_atr[i]:
+                continue
+            row = rows[i]
             dt = row.get("date")
             if dt is None:
                 dt = m5_df.index[i]
             if not hasattr(dt, "hour"):
                 continue
 
-            if pd.isna(row.get("atr")) or row.get("atr", 0) <= 0:
-                continue
-
             # Normalize to UTC
             if dt.tzinfo is not None:
                 dt_utc = dt.astimezone(datetime.now(timezone.utc).tzinfo)
@@ -353,13 +523,13 @@ class Backtester:
                 continue
 
             # Get previous bar for false breakout detection
-            prev_row = m5_df.iloc[i - 1] if i > 0 else None
+            prev_row = rows[i - 1] if i > 0 else None
 
             result = engine.score_bar(
                 m5_row=row,
                 m5_prev=prev_row,
                 opening_range=orng,
-                atr=float(row["atr"]),
+                atr=float(atr[i]),
                 bar_time=dt_utc,
             )
 
@@ -373,17 +543,17 @@ class Backtester:
 
             day_signaled.setdefault(day_key, set()).add(direction)
 
-            signals.append({
-                "index": i,
-                "direction": direction,
-                "conviction": result["conviction"] or "MEDIUM",
-                "price": row["close"],
-                "atr": float(row["atr"]),
-                "score": result["score"],
-                "sl_dist": result["sl_dist"],
-                "tp_dist": result["tp_dist"],
-                "signal_type": result["signal"],
-            })
+            signals.append(BacktestSignal(
+                index=i,
+                direction=direction,
+                conviction=result["conviction"] or "MEDIUM",
+                price=close[i],
+                atr=float(atr[i]),
+                score=result["score"],
+                sl_dist=result["sl_dist"],
+                tp_dist=result["tp_dist"],
+                signal_type=result["signal"],
+            ))
 
         return signals
 
@@ -434,7 +604,7 @@ class Backtester:
         signals = self._intraday_signals(h1_df, m15_df, sltp_approach, instrument)
 
         # Simulate — use ATR multipliers as fallback for pure_atr approach
-        trades, equity_curve = self._simulate(
+        trades, eq_dates, eq_values = self._simulate(
             h1_df, signals, instrument,
             initial_balance=initial_balance,
             risk_percent=risk_percent,
@@ -448,7 +618,7 @@ class Backtester:
 
         return self._compile_results(
             instrument_key, strategy, period,
-            initial_balance, trades, equity_curve,
+            initial_balance, trades, eq_dates, eq_values,
         )
 
     def _intraday_signals(
@@ -457,7 +627,7 @@ class Backtester:
         m15_df: pd.DataFrame,
         sltp_approach: str,
         instrument: InstrumentSpec,
-    ) -> list[dict]:
+    ) -> list[BacktestSignal]:
         """Generate intraday signals using IntradayScoringEngine with per-signal SL/TP."""
         from app.services.patterns import compute_sr_levels
 
@@ -469,19 +639,19 @@ class Backtester:
         # Pre-compute M15 row lookup
         m15_dates = m15_df.index if "date" not in m15_df.columns else m15_df["date"]
 
+        atrs = h1_df["atr"].to_numpy(dtype=float)
+        ready = ~np.isnan(h1_df["sma50"].to_numpy(dtype=float)) & (atrs > 0)
+        rows = h1_df.to_dict("records")
+
         warmup = 50  # Need SMA50 at minimum
         for i in range(warmup, len(h1_df)):
-            h1_row = h1_df.iloc[i]
-
-            if pd.isna(h1_row.get("sma50")) or pd.isna(h1_row.get("atr")):
-                continue
-
-            atr = float(h1_row["atr"])
-            if atr <= 0:
+            if not ready[i]:
                 continue
+            h1_row = rows[i]
+            atr = float(atrs[i])
 
             # Find matching M15 row
-            h1_date = h1_df.iloc[i].get("date") if "date" in h1_df.columns else h1_df.index[i]
+            h1_date = h1_row.get("date") if "date" in h1_df.columns else h1_df.index[i]
             m15_row = None
             if h1_date is not None:
                 try:
@@ -496,7 +666,7 @@ class Backtester:
             # Get bar_time for session scoring
             bar_time = None
             bar_date = h1_row.get("date")
-            if bar_date is not None and hasattr(bar_date, "hour"):
+            if bar_date is not None:
                 bar_time = bar_date
                 if bar_time.tzinfo is None:
                     bar_time = bar_time.replace(tzinfo=timezone.utc)
@@ -518,14 +688,14 @@ class Backtester:
             conviction = result["conviction"] or "MEDIUM"
             price = float(h1_row["close"])
 
-            signal = {
-                "index": i,
-                "direction": direction,
-                "conviction": conviction,
-                "price": price,
-                "atr": atr,
-                "score": result["total_score"],
-            }
+            signal = BacktestSignal(
+                index=i,
+                direction=direction,
+                conviction=conviction,
+                price=price,
+                atr=atr,
+                score=result["total_score"],
+            )
 
             # Compute S/R-based SL/TP for approaches 2-4
             if sltp_approach != "pure_atr":
@@ -540,8 +710,8 @@ class Backtester:
                         price, direction, atr, supports, resistances, sltp_approach,
                     )
                     if sl_tp is not None:
-                        signal["sl_dist"] = sl_tp[0]
-                        signal["tp_dist"] = sl_tp[1]
+                        signal.sl_dist = sl_tp[0]
+                        signal.tp_dist = sl_tp[1]
                     else:
                         # S/R computation failed — skip this signal for non-pure-atr approaches
                         continue
@@ -628,25 +798,64 @@ class Backtester:
         interval: str = "1d",
     ) -> pd.DataFrame | None:
         try:
-            ticker = yf.Ticker(instrument.yahoo_symbol)
-            if start_date and end_date:
-                df = ticker.history(start=start_date, end=end_date, interval=interval)
-            elif start_date:
-                df = ticker.history(start=start_date, interval=interval)
-            else:
-                df = ticker.history(period=period, interval=interval)
-            if df is None or df.empty:
-                return None
-            df = df.reset_index()
-            df.columns = [c.lower() for c in df.columns]
-            # Normalize: yfinance uses "datetime" for intraday, "date" for daily
-            if "datetime" in df.columns and "date" not in df.columns:
-                df = df.rename(columns={"datetime": "date"})
-            return df
+            return self._history(instrument.yahoo_symbol, period, start_date, end_date, interval)
         except Exception as e:
             logger.warning("Backtest data fetch failed for %s: %s", instrument.key, e)
             return None
 
+    def _history(
+        self, symbol: str, period: str,
+        start_date: str | None, end_date: str | None, interval: str,
+    ) -> pd.DataFrame | None:
+        """Download OHLC history with lower-case columns and a ``date`` column.
+
+        With a cache directory configured, the normalized frame is kept on disk
+        per (symbol, interval, period, start, end) so repeated runs skip yfinance.
+        """
+        path = None
+        if self.cache_dir is not None:
+            key = f"{symbol}|{interval}|{period}|{start_date}|{end_date}"
+            path = self.cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.pkl"
+            ttl = self.cache_ttl_seconds
+            if interval != "1d":
+                ttl = min(ttl, _INTRADAY_CACHE_TTL_SECONDS)
+            try:
+                if time.time() - path.stat().st_mtime < ttl:
+                    return pd.read_pickle(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.debug("Ignoring unreadable backtest cache entry %s: %s", path, e)
+
+        ticker = yf.Ticker(symbol)
+        if start_date and end_date:
+            df = ticker.history(start=start_date, end=end_date, interval=interval)
+        elif start_date:
+            df = ticker.history(start=start_date, interval=interval)
+        else:
+            df = ticker.history(period=period, interval=interval)
+        if df is None or df.empty:
+            return None
+        df = df.reset_index()
+        df.columns = [c.lower() for c in df.columns]
+        # Normalize: yfinance uses "datetime" for intraday, "date" for daily
+        if "datetime" in df.columns and "date" not in df.columns:
+            df = df.rename(columns={"datetime": "date"})
+        # Downstream code relies on a real datetime column (.dt, isoformat, datetime64 days)
+        if "date" in df.columns:
+            df["date"] = pd.to_datetime(df["date"])
+
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent backtest workers never read a partial file
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                df.to_pickle(tmp)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.debug("Could not write backtest cache entry %s: %s", path, e)
+        return df
+
     def _fetch_fx_series(
         self, instrument: InstrumentSpec, period: str,
         start_date: str | None = None, end_date: str | None = None,
@@ -667,30 +876,17 @@ class Backtester:
             return None
 
         try:
-            ticker = yf.Ticker(ticker_sym)
-            if start_date and end_date:
-                fx_df = ticker.history(start=start_date, end=end_date, interval="1d")
-            elif start_date:
-                fx_df = ticker.history(start=start_date, interval="1d")
-            else:
-                fx_df = ticker.history(period=period, interval="1d")
-
-            if fx_df is None or fx_df.empty:
+            fx_df = self._history(ticker_sym, period, start_date, end_date, "1d")
+            if fx_df is None:
                 return None
 
-            fx_df = fx_df.reset_index()
-            fx_df.columns = [c.lower() for c in fx_df.columns]
-
-            fx_map: dict[object, float] = {}
-            for _, row in fx_df.iterrows():
-                dt = row["date"]
-                date_key = dt.date() if hasattr(dt, "date") else dt
-                rate = row["close"]
-                if instrument.currency == "JPY":
-                    fx_map[date_key] = 1.0 / rate  # 1 JPY → USD
-                else:
-                    fx_map[date_key] = rate  # e.g. 1 GBP → USD
-            return fx_map
+            date_keys = fx_df["date"].dt.date
+            rates = fx_df["close"].to_numpy(dtype=float)
+            if instrument.currency == "JPY":
+                factors = 1.0 / rates  # 1 JPY → USD
+            else:
+                factors = rates  # e.g. 1 GBP → USD
+            return dict(zip(date_keys.tolist(), factors.tolist()))
         except Exception as e:
             logger.warning("FX rate fetch failed for %s: %s", instrument.currency, e)
             return None
@@ -698,9 +894,18 @@ class Backtester:
     def _compute_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         from app.services.indicators import compute_indicators
 
-        return compute_indicators(df)
+        key = int(pd.util.hash_pandas_object(df, index=False).sum())
+        cached = _indicator_cache.get(key)
+        if cached is None:
+            cached = compute_indicators(df.copy())
+            _indicator_cache[key] = cached
+            if len(_indicator_cache) > _INDICATOR_CACHE_SIZE:
+                _indicator_cache.popitem(last=False)
+        else:
+            _indicator_cache.move_to_end(key)
+        return cached.copy()
 
-    def _generate_signals(self, df: pd.DataFrame, strategy: str) -> list[dict]:
+    def _generate_signals(self, df: pd.DataFrame, strategy: str) -> list[BacktestSignal]:
         """Generate entry signals based on strategy."""
         signals = []
 
@@ -713,59 +918,61 @@ class Backtester:
 
         return signals
 
-    def _sma_crossover_signals(self, df: pd.DataFrame) -> list[dict]:
-        signals = []
-        for i in range(51, len(df)):
-            row = df.iloc[i]
-            prev = df.iloc[i - 1]
+    def _sma_crossover_signals(self, df: pd.DataFrame) -> list[BacktestSignal]:
+        s20 = df["sma20"].to_numpy(dtype=float)
+        s50 = df["sma50"].to_numpy(dtype=float)
+        s200 = df["sma200"].to_numpy(dtype=float)
+        close = df["close"].to_numpy(dtype=float)
+        atr = df["atr"].to_numpy(dtype=float)
 
-            if pd.isna(row["sma20"]) or pd.isna(row["sma50"]):
-                continue
+        # Crossovers on bar i vs bar i-1, evaluated for every bar at once.
+        # NaN comparisons are False, so bars without both SMAs never signal.
+        prev20, prev50 = np.roll(s20, 1), np.roll(s50, 1)
+        bull = (prev20 <= prev50) & (s20 > s50)  # SMA20 crosses above SMA50
+        bear = (prev20 >= prev50) & (s20 < s50)  # SMA20 crosses below SMA50
+        bull[:51] = bear[:51] = False
 
-            # Bullish crossover: SMA20 crosses above SMA50
-            if prev["sma20"] <= prev["sma50"] and row["sma20"] > row["sma50"]:
-                conviction = "HIGH" if (not pd.isna(row.get("sma200")) and row["close"] > row["sma200"]) else "MEDIUM"
-                signals.append({
-                    "index": i, "direction": "BUY", "conviction": conviction,
-                    "price": row["close"], "atr": row["atr"],
-                })
-            # Bearish crossover: SMA20 crosses below SMA50
-            elif prev["sma20"] >= prev["sma50"] and row["sma20"] < row["sma50"]:
-                conviction = "HIGH" if (not pd.isna(row.get("sma200")) and row["close"] < row["sma200"]) else "MEDIUM"
-                signals.append({
-                    "index": i, "direction": "SELL", "conviction": conviction,
-                    "price": row["close"], "atr": row["atr"],
-                })
+        signals = []
+        for i in np.flatnonzero(bull | bear).tolist():
+            if bull[i]:
+                direction, with_trend = "BUY", close[i] > s200[i]
+            else:
+                direction, with_trend = "SELL", close[i] < s200[i]
+            signals.append(BacktestSignal(
+                index=i, direction=direction, conviction="HIGH" if with_trend else "MEDIUM",
+                price=close[i], atr=atr[i],
+            ))
 
         return signals
 
-    def _rsi_reversal_signals(self, df: pd.DataFrame) -> list[dict]:
-        signals = []
-        for i in range(201, len(df)):
-            row = df.iloc[i]
-            if pd.isna(row["rsi"]) or pd.isna(row["sma200"]):
-                continue
+    def _rsi_reversal_signals(self, df: pd.DataFrame) -> list[BacktestSignal]:
+        rsi = df["rsi"].to_numpy(dtype=float)
+        s200 = df["sma200"].to_numpy(dtype=float)
+        close = df["close"].to_numpy(dtype=float)
+        atr = df["atr"].to_numpy(dtype=float)
+
+        # RSI < 30 + price above SMA200 = BUY; RSI > 70 + price below SMA200 = SELL
+        # (NaN RSI/SMA200 compare False, so warm-up bars drop out)
+        buy = (rsi < 30) & (close > s200)
+        sell = (rsi > 70) & (close < s200)
+        buy[:201] = sell[:201] = False
 
-            # RSI < 30 + price above SMA200 = BUY
-            if row["rsi"] < 30 and row["close"] > row["sma200"]:
-                conviction = "HIGH" if row["rsi"] < 25 else "MEDIUM"
-                signals.append({
-                    "index": i, "direction": "BUY", "conviction": conviction,
-                    "price": row["close"], "atr": row["atr"],
-                })
-            # RSI > 70 + price below SMA200 = SELL
-            elif row["rsi"] > 70 and row["close"] < row["sma200"]:
-                conviction = "HIGH" if row["rsi"] > 75 else "MEDIUM"
-                signals.append({
-                    "index": i, "direction": "SELL", "conviction": conviction,
-                    "price": row["close"], "atr": row["atr"],
-                })
+        signals = []
+        for i in np.flatnonzero(buy | sell).tolist():
+            if buy[i]:
+                direction, extreme = "BUY", rsi[i] < 25
+            else:
+                direction, extreme = "SELL", rsi[i] > 75
+            signals.append(BacktestSignal(
+                index=i, direction=direction, conviction="HIGH" if extreme else "MEDIUM",
+                price=close[i], atr=atr[i],
+            ))
 
         return signals
 
     def _krabbe_scored_signals(
         self, df: pd.DataFrame, macro_df: pd.DataFrame | None, instrument_key: str,
-    ) -> list[dict]:
+    ) -> list[BacktestSignal]:
         """Generate signals using the Krabbe 11-factor scoring engine."""
         engine = ScoringEngine()
         signals = []
@@ -775,28 +982,27 @@ class Backtester:
         # Align macro data by date if available
         macro_aligned = {}
         if macro_df is not None and not macro_df.empty:
-            for idx_val, macro_row in macro_df.iterrows():
-                date_key = idx_val
-                if hasattr(date_key, "date"):
-                    date_key = date_key.date()
-                macro_aligned[date_key] = macro_row
+            index = macro_df.index
+            date_keys = index.date if isinstance(index, pd.DatetimeIndex) else index
+            # Plain dict rows: the scoring engine only needs .get() on them
+            macro_aligned = dict(zip(date_keys, macro_df.to_dict("records")))
+
+        close = df["close"].to_numpy(dtype=float)
+        atr = df["atr"].to_numpy(dtype=float)
+        ready = ~(np.isnan(df["sma50"].to_numpy(dtype=float)) | np.isnan(atr))
+        rows = df.to_dict("records")
 
         warmup = 50  # Need SMA50 at minimum
         for i in range(warmup, len(df)):
-            row = df.iloc[i]
-
-            if pd.isna(row.get("sma50")) or pd.isna(row.get("atr")):
+            if not ready[i]:
                 continue
+            row = rows[i]
 
             # Find matching macro row by date
             macro_row = None
             bar_date = row.get("date")
             if bar_date is not None and macro_aligned:
-                if hasattr(bar_date, "date"):
-                    bar_date_key = bar_date.date()
-                else:
-                    bar_date_key = bar_date
-                macro_row = macro_aligned.get(bar_date_key)
+                macro_row = macro_aligned.get(bar_date.date())
 
             result = engine.score_bar(row, macro_row, instrument_key)
 
@@ -810,56 +1016,54 @@ class Backtester:
 
             conviction = result["conviction"] or "MEDIUM"
 
-            signals.append({
-                "index": i,
-                "direction": direction,
-                "conviction": conviction,
-                "price": row["close"],
-                "atr": row["atr"],
-                "score": result["total_score"],
-            })
+            signals.append(BacktestSignal(
+                index=i,
+                direction=direction,
+                conviction=conviction,
+                price=close[i],
+                atr=atr[i],
+                score=result["total_score"],
+            ))
 
             last_signal_idx = i
             last_signal_dir = direction
 
         return signals
 
-    def _breakout_signals(self, df: pd.DataFrame) -> list[dict]:
-        signals = []
-        for i in range(21, len(df)):
-            row = df.iloc[i]
-            prev = df.iloc[i - 1]
+    def _breakout_signals(self, df: pd.DataFrame) -> list[BacktestSignal]:
+        high20 = df["high_20"].to_numpy(dtype=float)
+        low20 = df["low_20"].to_numpy(dtype=float)
+        close = df["close"].to_numpy(dtype=float)
+        atr = df["atr"].to_numpy(dtype=float)
 
-            if pd.isna(row["high_20"]) or pd.isna(row["atr"]):
-                continue
+        # Compare each bar's close with the previous bar's 20-day high/low
+        prev_high_20, prev_low_20 = np.roll(high20, 1), np.roll(low20, 1)
+        valid = ~(np.isnan(high20) | np.isnan(atr) | np.isnan(prev_high_20) | np.isnan(prev_low_20))
+        valid[:21] = False
 
-            prev_high_20 = df.iloc[i - 1]["high_20"] if not pd.isna(df.iloc[i - 1]["high_20"]) else None
-            prev_low_20 = df.iloc[i - 1]["low_20"] if not pd.isna(df.iloc[i - 1]["low_20"]) else None
-
-            if prev_high_20 is None or prev_low_20 is None:
-                continue
+        up_move = close - prev_high_20
+        down_move = prev_low_20 - close
+        # Breakout above 20-day high / breakdown below 20-day low, with ATR confirmation
+        buy = valid & (close > prev_high_20) & (up_move > atr * 0.5)
+        sell = valid & ~buy & (close < prev_low_20) & (down_move > atr * 0.5)
 
-            # Breakout above 20-day high with ATR confirmation
-            if row["close"] > prev_high_20 and (row["close"] - prev_high_20) > row["atr"] * 0.5:
-                conviction = "HIGH" if (row["close"] - prev_high_20) > row["atr"] else "MEDIUM"
-                signals.append({
-                    "index": i, "direction": "BUY", "conviction": conviction,
-                    "price": row["close"], "atr": row["atr"],
-                })
-            # Breakdown below 20-day low
-            elif row["close"] < prev_low_20 and (prev_low_20 - row["close"]) > row["atr"] * 0.5:
-                conviction = "HIGH" if (prev_low_20 - row["close"]) > row["atr"] else "MEDIUM"
-                signals.append({
-                    "index": i, "direction": "SELL", "conviction": conviction,
-                    "price": row["close"], "atr": row["atr"],
-                })
+        signals = []
+        for i in np.flatnonzero(buy | sell).tolist():
+            if buy[i]:
+                direction, strong = "BUY", up_move[i] > atr[i]
+            else:
+                direction, strong = "SELL", down_move[i] > atr[i]
+            signals.append(BacktestSignal(
+                index=i, direction=direction, conviction="HIGH" if strong else "MEDIUM",
+                price=close[i], atr=atr[i],
+            ))
 
         return signals
 
     def _simulate(
         self,
         df: pd.DataFrame,
-        signals: list[dict],
+        signals: list[BacktestSignal],
         instrument: InstrumentSpec,
         initial_balance: float,
         risk_percent: float,
@@ -870,32 +1074,69 @@ class Backtester:
         max_trades: int | None = None,
         fx_map: dict[object, float] | None = None,
         runner: bool = False,
-    ) -> tuple[list[BacktestTrade], list[dict]]:
+    ) -> tuple[list[BacktestTrade], list[str], list[float]]:
         balance = initial_balance
         trades: list[BacktestTrade] = []
-        equity_curve = [{"date": df.iloc[0]["date"].isoformat() if hasattr(df.iloc[0]["date"], "isoformat") else str(df.iloc[0]["date"]), "equity": balance}]
+        # Bar timestamps pulled out once; only bars that open or close a trade are formatted
+        dates = df["date"].tolist()
+        # Equity curve kept as parallel date/value lists; zipped into dicts only for the response
+        eq_dates = [dates[0].isoformat()]
+        eq_values = [balance]
+
+        # Calendar day of every bar (local to the data's timezone) as a day number,
+        # plus a weekend flag, for the daily trade cap and the session filter
+        bar_dates = df["date"]
+        if bar_dates.dt.tz is not None:
+            bar_dates = bar_dates.dt.tz_localize(None)
+        day_nums = bar_dates.to_numpy().astype("datetime64[D]").view("int64")
+        weekend = ((day_nums + 3) % 7 >= 5).tolist()  # 1970-01-01 was a Thursday
+        day_keys = day_nums.tolist()
 
         in_position = False
         cooldown_until = -1
         consecutive_losses = 0
-        daily_trades: dict[str, int] = {}
+        daily_trades: dict[int, int] = {}
 
-        # Pre-compute fallback FX factor (last available rate)
-        _fx_fallback = list(fx_map.values())[-1] if fx_map else 1.0
+        highs = df["high"].to_numpy(dtype=float)
+        lows = df["low"].to_numpy(dtype=float)
+        closes = df["close"].to_numpy(dtype=float)
 
-        def _get_fx(bar_date) -> float:
-            """Get quote-to-USD conversion factor for a given date."""
-            if fx_map is None:
-                return 1.0
-            date_key = bar_date.date() if hasattr(bar_date, "date") else bar_date
-            return fx_map.get(date_key, _fx_fallback)
+        # Quote-to-USD conversion factor for every bar, falling back to the last available rate
+        if fx_map:
+            fx_fallback = next(reversed(fx_map.values()))
+            fx_factors = np.array([fx_map.get(day, fx_fallback) for day in df["date"].dt.date.tolist()], dtype=float)
+        else:
+            fx_factors = np.ones(len(df))
 
-        for signal in signals:
+        # Stop/target distances and risk % for every signal, computed up front
+        sig_atr = np.array([signal.atr for signal in signals], dtype=float)
+        has_atr = (sig_atr > 0).tolist()
+        sl_dists = np.minimum(
+            np.maximum(sig_atr * atr_sl_mult, instrument.min_stop_distance), instrument.max_stop_distance,
+        )
+        tp_dists = np.maximum(sig_atr * atr_tp_mult, sl_dists)  # minimum 1:1
+        # Per-signal SL/TP overrides (used by intraday strategies)
+        sl_override = np.array([signal.sl_dist for signal in signals], dtype=float)  # None -> NaN
+        has_sl = ~np.isnan(sl_override)
+        sl_dists[has_sl] = np.maximum(
+            np.minimum(sl_override[has_sl], instrument.max_stop_distance), instrument.min_stop_distance,
+        )
+        tp_override = np.array([signal.tp_dist for signal in signals], dtype=float)
+        has_tp = ~np.isnan(tp_override)
+        tp_dists[has_tp] = np.maximum(tp_override[has_tp], sl_dists[has_tp] * 0.5)
+        sl_dists, tp_dists = sl_dists.tolist(), tp_dists.tolist()
+        # Conviction-based sizing: HIGH = full risk, MEDIUM = 75%, anything else = 50%
+        convictions = np.array([signal.conviction for signal in signals], dtype=object)
+        risk_pcts = np.select(
+            [convictions == "HIGH", convictions == "MEDIUM"], [risk_percent, risk_percent * 0.75], risk_percent * 0.5,
+        ).tolist()
+
+        for j, signal in enumerate(signals):
             # Stop if max trades reached
             if max_trades is not None and len(trades) >= max_trades:
                 break
 
-            idx = signal["index"]
+            idx = signal.index
             if idx >= len(df) - 1:
                 continue
 
@@ -908,34 +1149,22 @@ class Backtester:
                 continue
 
             # Simple daily trade count check
-            date_key = str(df.iloc[idx]["date"])[:10]
+            date_key = day_keys[idx]
             if daily_trades.get(date_key, 0) >= 5:
                 continue
 
-            atr = signal.get("atr")
-            if pd.isna(atr) or atr is None or atr <= 0:
+            if not has_atr[j]:
                 continue
 
             # Session filter: skip weekends for instruments with sessions
             if session_filter and instrument.trading_sessions:
-                dt = df.iloc[idx]["date"]
-                if hasattr(dt, "weekday") and dt.weekday() >= 5:
+                if weekend[idx]:
                     continue
 
-            # Calculate SL/TP
-            sl_dist = max(atr * atr_sl_mult, instrument.min_stop_distance)
-            sl_dist = min(sl_dist, instrument.max_stop_distance)
-            tp_dist = atr * atr_tp_mult
-            tp_dist = max(tp_dist, sl_dist)  # minimum 1:1
-
-            # Per-signal SL/TP overrides (used by intraday strategies)
-            if "sl_dist" in signal and signal["sl_dist"] is not None:
-                sl_dist = max(min(signal["sl_dist"], instrument.max_stop_distance), instrument.min_stop_distance)
-            if "tp_dist" in signal and signal["tp_dist"] is not None:
-                tp_dist = max(signal["tp_dist"], sl_dist * 0.5)
-
-            entry_price = signal["price"]
-            direction = signal["direction"]
+            sl_dist = sl_dists[j]
+            tp_dist = tp_dists[j]
+            entry_price = signal.price
+            direction = signal.direction
 
             if direction == "BUY":
                 sl_price = entry_price - sl_dist
@@ -945,17 +1174,10 @@ class Backtester:
                 tp_price = entry_price - tp_dist
 
             # Position sizing
-            conviction = signal.get("conviction", "MEDIUM")
-            if conviction == "HIGH":
-                risk_pct = risk_percent
-            elif conviction == "MEDIUM":
-                risk_pct = risk_percent * 0.75
-            else:
-                risk_pct = risk_percent * 0.5
-
-            risk_amount = balance * (risk_pct / 100)
+            conviction = signal.conviction
+            risk_amount = balance * (risk_pcts[j] / 100)
             # Convert SL distance to USD for proper cross-currency sizing
-            entry_fx = _get_fx(df.iloc[idx]["date"])
+            entry_fx = fx_factors[idx]
             sl_dist_usd = sl_dist * entry_fx * instrument.multiplier
             raw_size = risk_amount / sl_dist_usd if sl_dist_usd > 0 else 0
 
@@ -969,87 +1191,26 @@ class Backtester:
 
             # Simulate trade outcome using future bars
             in_position = True
-            exit_price = None
-            exit_reason = "end_of_data"
-            exit_idx = len(df) - 1
-
-            # Partial TP tracking
-            partial_filled = False
+            exit_idx, exit_price, exit_reason, sl_price, partial_filled = _scan_exit(
+                highs, lows, idx + 1, direction == "BUY",
+                entry_price, sl_price, tp_price, sl_dist, partial_tp, runner,
+            )
             partial_pnl = 0.0
-
-            # Runner state: track peak price for trailing SL
-            peak_price = entry_price
-
-            for j in range(idx + 1, len(df)):
-                bar = df.iloc[j]
-
+            if partial_filled:
                 if direction == "BUY":
-                    # Check SL (or trailing SL)
-                    if bar["low"] <= sl_price:
-                        exit_price = sl_price
-                        if partial_tp and partial_filled and runner:
-                            exit_reason = "trailing_sl"
-                        else:
-                            exit_reason = "sl"
-                        exit_idx = j
-                        break
-                    # Check partial TP (at 1R)
-                    if partial_tp and not partial_filled:
-                        tp1_price = entry_price + sl_dist  # 1R
-                        if bar["high"] >= tp1_price:
-                            partial_pnl = (tp1_price - entry_price) * (size * 0.5) * instrument.multiplier
-                            partial_filled = True
-                            if runner:
-                                # Move SL to breakeven, start trailing
-                                sl_price = entry_price
-                                peak_price = tp1_price
-                    # Runner mode: trail SL at 1R behind peak
-                    if runner and partial_tp and partial_filled:
-                        peak_price = max(peak_price, bar["high"])
-                        trailing_sl = max(entry_price, peak_price - sl_dist)
-                        if trailing_sl > sl_price:
-                            sl_price = trailing_sl
-                    elif not runner:
-                        # Check fixed TP2
-                        if bar["high"] >= tp_price:
-                            exit_price = tp_price
-                            exit_reason = "tp"
-                            exit_idx = j
-                            break
-                else:  # SELL
-                    if bar["high"] >= sl_price:
-                        exit_price = sl_price
-                        if partial_tp and partial_filled and runner:
-                            exit_reason = "trailing_sl"
-                        else:
-                            exit_reason = "sl"
-                        exit_idx = j
-                        break
-                    if partial_tp and not partial_filled:
-                        tp1_price = entry_price - sl_dist
-                        if bar["low"] <= tp1_price:
-                            partial_pnl = (entry_price - tp1_price) * (size * 0.5) * instrument.multiplier
-                            partial_filled = True
-                            if runner:
-                                sl_price = entry_price
-                                peak_price = tp1_price
-                    if runner and partial_tp and partial_filled:
-                        peak_price = min(peak_price, bar["low"])
-                        trailing_sl = min(entry_price, peak_price + sl_dist)
-                        if trailing_sl < sl_price:
-                            sl_price = trailing_sl
-                    elif not runner:
-                        if bar["low"] <= tp_price:
-                            exit_price = tp_price
-                            exit_reason = "tp"
-                            exit_idx = j
-                            break
+                    tp1_price = entry_price + sl_dist  # 1R
+                    partial_pnl = (tp1_price - entry_price) * (size * 0.5) * instrument.multiplier
+                else:
+                    tp1_price = entry_price - sl_dist
+                    partial_pnl = (entry_price - tp1_price) * (size * 0.5) * instrument.multiplier
 
             if exit_price is None:
-                exit_price = df.iloc[exit_idx]["close"]
+                exit_price = closes[exit_idx]
 
             # Calculate P&L (in quote currency, then convert to USD)
-            exit_fx = _get_fx(df.iloc[exit_idx]["date"])
+            entry_date = dates[idx].isoformat()
+            exit_date = dates[exit_idx].isoformat()
+            exit_fx = fx_factors[exit_idx]
 
             if partial_tp and partial_filled:
                 if exit_reason == "sl":
@@ -1088,10 +1249,9 @@ class Backtester:
             else:
                 consecutive_losses = 0
 
-            exit_date = df.iloc[exit_idx]["date"]
             trades.append(BacktestTrade(
-                entry_date=df.iloc[idx]["date"].isoformat() if hasattr(df.iloc[idx]["date"], "isoformat") else str(df.iloc[idx]["date"]),
-                exit_date=exit_date.isoformat() if hasattr(exit_date, "isoformat") else str(exit_date),
+                entry_date=entry_date,
+                exit_date=exit_date,
                 direction=direction,
                 entry_price=round(entry_price, 4),
                 exit_price=round(exit_price, 4),
@@ -1103,12 +1263,10 @@ class Backtester:
                 exit_reason=exit_reason,
             ))
 
-            equity_curve.append({
-                "date": exit_date.isoformat() if hasattr(exit_date, "isoformat") else str(exit_date),
-                "equity": round(balance, 2),
-            })
+            eq_dates.append(exit_date)
+            eq_values.append(round(balance, 2))
 
-        return trades, equity_curve
+        return trades, eq_dates, eq_values
 
     def _compile_results(
         self,
@@ -1117,8 +1275,10 @@ class Backtester:
         period: str,
         initial_balance: float,
         trades: list[BacktestTrade],
-        equity_curve: list[dict],
+        eq_dates: list[str],
+        eq_values: list[float],
     ) -> dict:
+        equity_curve = [{"date": d, "equity": v} for d, v in zip(eq_dates, eq_values)]
         if not trades:
             return {
                 "instrument": instrument_key,
@@ -1139,49 +1299,48 @@ class Backtester:
                 "monthly_breakdown": [],
             }
 
-        wins = [t for t in trades if t.pnl > 0]
-        losses = [t for t in trades if t.pnl < 0]
-
         total = len(trades)
-        win_rate = len(wins) / total * 100 if total > 0 else 0
-        avg_win = sum(t.pnl for t in wins) / len(wins) if wins else 0
-        avg_loss = sum(t.pnl for t in losses) / len(losses) if losses else 0
-
-        win_pct = len(wins) / total if total > 0 else 0
-        loss_pct = len(losses) / total if total > 0 else 0
+        pnls = np.fromiter((t.pnl for t in trades), dtype=float, count=total)
+        win_mask = pnls > 0
+        loss_mask = pnls < 0
+        n_wins = int(win_mask.sum())
+        n_losses = int(loss_mask.sum())
+        gross_profit = float(pnls[win_mask].sum())
+        loss_sum = float(pnls[loss_mask].sum())
+
+        win_rate = n_wins / total * 100
+        avg_win = gross_profit / n_wins if n_wins else 0
+        avg_loss = loss_sum / n_losses if n_losses else 0
+
+        win_pct = n_wins / total
+        loss_pct = n_losses / total
         expectancy = (win_pct * avg_win) + (loss_pct * avg_loss)
 
-        gross_profit = sum(t.pnl for t in wins)
-        gross_loss = abs(sum(t.pnl for t in losses))
+        gross_loss = abs(loss_sum)
         profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else (999.99 if gross_profit > 0 else 0.0)
 
-        # Max drawdown from equity curve
-        peak = initial_balance
-        max_dd = 0
-        for point in equity_curve:
-            eq = point["equity"]
-            if eq > peak:
-                peak = eq
-            dd = (peak - eq) / peak * 100 if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
-
-        final_balance = equity_curve[-1]["equity"] if equity_curve else initial_balance
-        total_return = (final_balance - initial_balance) / initial_balance * 100
+        # Max drawdown from equity curve: running peak vs equity at each point
+        equity = np.asarray(eq_values, dtype=float)
+        peaks = np.maximum(np.maximum.accumulate(equity), initial_balance)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = np.where(peaks > 0, (peaks - equity) / peaks * 100, 0.0)
+        max_dd = max(float(drawdowns.max()), 0.0)
 
-        # Monthly breakdown
-        from collections import defaultdict
-        monthly: dict[str, dict] = defaultdict(lambda: {"pnl": 0.0, "trades": 0, "wins": 0})
-        for t in trades:
-            month_key = t.exit_date[:7]
-            monthly[month_key]["pnl"] += t.pnl
-            monthly[month_key]["trades"] += 1
-            if t.pnl > 0:
-                monthly[month_key]["wins"] += 1
+        final_balance = eq_values[-1] if eq_values else initial_balance
+        total_return = (final_balance - initial_balance) / initial_balance * 100
 
+        # Monthly breakdown (groups come back sorted by month)
+        months = [t.exit_date[:7] for t in trades]
+        monthly = (
+            pd.DataFrame({"pnl": pnls, "win": win_mask}, index=months)
+            .groupby(level=0)
+            .agg(pnl=("pnl", "sum"), trades=("pnl", "size"), wins=("win", "sum"))
+        )
         monthly_breakdown = [
-            {"month": k, "pnl": round(v["pnl"], 2), "trades": v["trades"], "win_rate": round(v["wins"] / v["trades"] * 100, 1) if v["trades"] > 0 else 0}
-            for k, v in sorted(monthly.items())
+            {"month": k, "pnl": round(pnl, 2), "trades": n, "win_rate": round(w / n * 100, 1)}
+            for k, pnl, n, w in zip(
+                monthly.index, monthly["pnl"].tolist(), monthly["trades"].tolist(), monthly["wins"].tolist(),
+            )
         ]
 
         return {
@@ -1191,8 +1350,8 @@ class Backtester:
             "initial_balance": initial_balance,
             "final_balance": round(final_balance, 2),
             "total_trades": total,
-            "winning_trades": len(wins),
-            "losing_trades": len(losses),
+            "winning_trades": n_wins,
+            "losing_trades": n_losses,
             "win_rate": round(win_rate, 2),
             "expectancy": round(expectancy, 2),
             "profit_factor": round(profit_factor, 2),
@@ -9,16 +9,30 @@ Scoring:
   No high-impact events        →  0  (neutral)
 """
 
+import asyncio
 import logging
+import os
+import re
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 CALENDAR_URL = "https://nfs.faireconomy.media/ff_calendar_thisweek.json"
 
+# ForexFactory event fields: "2024-01-15" + "8:30am", in ET (UTC-5)
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{1,2})\s*(AM|PM)")
+_ET_OFFSET = timedelta(hours=5)
+
+# Background refresh fires at this fraction of the TTL so polls never see an expired cache
+_PREFETCH_RATIO = 0.8
+_PREFETCH_RETRY_SECONDS = 60
+
 # Map instrument keys to relevant currency codes
 INSTRUMENT_COUNTRIES: dict[str, list[str]] = {
     "XAUUSD": ["USD"],
@@ -38,9 +52,45 @@ INSTRUMENT_COUNTRIES: dict[str, list[str]] = {
 class CalendarService:
     """Fetches economic calendar and scores event risk for instruments."""
 
-    def __init__(self):
+    def __init__(self, cache_path: str | Path | None = None):
         self._cache: tuple[list[dict], float] | None = None
         self._cache_ttl = 3600  # 1 hour
+        # Last good fetch is mirrored here so restarts keep the TTL and stale fallback
+        self._cache_path = Path(cache_path).expanduser() if cache_path else None
+        # Kept open so hourly refreshes reuse the keep-alive connection
+        self._client: httpx.AsyncClient | None = None
+        # Refresh in progress; concurrent cache misses await it instead of refetching
+        self._inflight: asyncio.Future | None = None
+        # High-impact events of the last fetched list, parsed once and bucketed by country
+        self._index: tuple[list[dict], dict[str, list[tuple[int, datetime, dict]]]] | None = None
+        self._refresher_task: asyncio.Task | None = None
+        if self._cache_path is not None:
+            self._load_cache()
+
+    def start(self):
+        """Start refreshing the calendar in the background ahead of cache expiry."""
+        if self._refresher_task is None:
+            self._refresher_task = asyncio.create_task(self._refresher())
+
+    async def aclose(self):
+        if self._refresher_task is not None:
+            self._refresher_task.cancel()
+            try:
+                await self._refresher_task
+            except asyncio.CancelledError:
+                pass
+            self._refresher_task = None
+        # A fetch still in flight would otherwise use the client after it's closed
+        if self._inflight is not None:
+            self._inflight.cancel()
+            try:
+                await self._inflight
+            except asyncio.CancelledError:
+                pass
+            self._inflight = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def get_calendar_risk(self, instrument_key: str) -> dict:
         """Return calendar risk score and upcoming events for an instrument.
@@ -55,38 +105,32 @@ class CalendarService:
         if events is None:
             return {"score": 0, "events": [], "hours_to_next": None, "error": "fetch_failed"}
 
+        by_country = self._high_impact_by_country(events)
         now = datetime.now(timezone.utc)
-        relevant = []
-
-        for event in events:
-            if event.get("impact", "").lower() != "high":
-                continue
-            # Match by currency
-            event_country = event.get("country", "")
-            if event_country not in currencies:
-                continue
-
-            # Parse event datetime
-            event_dt = self._parse_event_time(event)
-            if event_dt is None:
-                continue
+        candidates = []
 
-            hours_away = (event_dt - now).total_seconds() / 3600
-            # Only care about events in the future or within last 1h (just happened)
-            if hours_away < -1:
-                continue
+        for country in currencies:
+            for position, event_dt, event in by_country.get(country, ()):
+                hours_away = (event_dt - now).total_seconds() / 3600
+                # Only care about events in the future or within last 1h (just happened)
+                if hours_away < -1:
+                    continue
+                hours_away = round(hours_away, 1)
+                candidates.append((abs(hours_away), position, hours_away, country, event))
 
-            relevant.append({
+        # Sort by proximity; ties keep the feed's order
+        candidates.sort(key=lambda c: c[:2])
+        relevant = [
+            {
                 "title": event.get("title", "Unknown"),
-                "country": event_country,
+                "country": country,
                 "date": event.get("date", ""),
                 "time": event.get("time", ""),
-                "hours_away": round(hours_away, 1),
+                "hours_away": hours_away,
                 "impact": "high",
-            })
-
-        # Sort by proximity
-        relevant.sort(key=lambda e: abs(e["hours_away"]))
+            }
+            for _, _, hours_away, country, event in candidates
+        ]
 
         # Score based on nearest event — pure risk filter (0 to -2)
         if not relevant:
@@ -110,20 +154,52 @@ class CalendarService:
 
     async def _fetch_events(self) -> list[dict] | None:
         """Fetch calendar events with caching and stale fallback."""
-        now = time.monotonic()
-
         if self._cache is not None:
             data, ts = self._cache
-            if now - ts < self._cache_ttl:
+            if time.monotonic() - ts < self._cache_ttl:
                 return data
 
+        return await self._shared_refresh()
+
+    def _shared_refresh(self) -> asyncio.Future:
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+        # Shield so one caller going away doesn't cancel the others' result
+        return asyncio.shield(self._inflight)
+
+    def _prefetch_delay(self) -> float:
+        """Seconds until the cached list is due for a background refresh."""
+        if self._cache is None:
+            return 0.0
+        return self._cache[1] + self._cache_ttl * _PREFETCH_RATIO - time.monotonic()
+
+    async def _refresher(self):
+        while True:
+            delay = self._prefetch_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self._shared_refresh()
+            except Exception as e:
+                logger.warning("Calendar prefetch failed: %s", e)
+            # Fetch failed and the cache is still due — back off instead of spinning
+            if self._prefetch_delay() <= 0:
+                await asyncio.sleep(_PREFETCH_RETRY_SECONDS)
+
+    async def _refresh(self) -> list[dict] | None:
+        now = time.monotonic()
+        # Created on first use; no await between the check and the assignment
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10)
+
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(CALENDAR_URL)
-                resp.raise_for_status()
-                events = resp.json()
-                self._cache = (events, now)
-                return events
+            resp = await self._client.get(CALENDAR_URL)
+            resp.raise_for_status()
+            events = orjson.loads(resp.content)
+            self._cache = (events, now)
+            if self._cache_path is not None:
+                self._save_cache(events)
+            return events
         except Exception as e:
             logger.warning("Calendar fetch failed: %s", e)
             # Stale cache fallback
@@ -131,6 +207,57 @@ class CalendarService:
                 logger.info("Using stale calendar cache")
                 return self._cache[0]
             return None
+        finally:
+            self._inflight = None
+
+    def _load_cache(self):
+        """Seed the in-memory cache from the last fetch persisted to disk.
+
+        The file stores wall-clock time; its age is carried over to the monotonic
+        clock so a stale file is still refetched but remains the outage fallback.
+        """
+        try:
+            saved = orjson.loads(self._cache_path.read_bytes())
+            age = max(time.time() - float(saved["ts"]), 0.0)
+            events = saved["events"]
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable calendar cache %s: %s", self._cache_path, e)
+            return
+        if isinstance(events, list):
+            self._cache = (events, time.monotonic() - age)
+
+    def _save_cache(self, events: list[dict]):
+        # Write to a temp file and rename so a crash never leaves a truncated cache
+        tmp = self._cache_path.with_name(self._cache_path.name + ".tmp")
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(orjson.dumps({"ts": time.time(), "events": events}))
+            os.replace(tmp, self._cache_path)
+        except OSError as e:
+            logger.warning("Could not persist calendar cache %s: %s", self._cache_path, e)
+
+    def _high_impact_by_country(self, events: list[dict]) -> dict[str, list[tuple[int, datetime, dict]]]:
+        """Bucket high-impact events by country as (feed position, UTC time, event).
+
+        Built once per fetched list (the cache hands back the same list until the
+        next refresh), so calendar queries skip re-filtering and re-parsing.
+        """
+        if self._index is not None and self._index[0] is events:
+            return self._index[1]
+
+        by_country: dict[str, list[tuple[int, datetime, dict]]] = {}
+        for position, event in enumerate(events):
+            if event.get("impact", "").lower() != "high":
+                continue
+            event_dt = self._parse_event_time(event)
+            if event_dt is None:
+                continue
+            by_country.setdefault(event.get("country", ""), []).append((position, event_dt, event))
+
+        self._index = (events, by_country)
+        return by_country
 
     @staticmethod
     def _parse_event_time(event: dict) -> datetime | None:
@@ -141,26 +268,19 @@ class CalendarService:
         if not date_str:
             return None
 
-        # ForexFactory format: "2024-01-15" + "8:30am" (ET = UTC-5)
         try:
+            date_match = _DATE_RE.fullmatch(date_str)
+            if date_match is None:
+                return None
+            year, month, day = map(int, date_match.groups())
             if time_str and time_str.lower() not in ("", "all day", "tentative"):
-                # Normalize time: "8:30am" -> "08:30AM"
-                t = time_str.strip().upper()
-                dt_str = f"{date_str} {t}"
-                for fmt in ("%Y-%m-%d %I:%M%p", "%Y-%m-%d %I:%M %p"):
-                    try:
-                        dt = datetime.strptime(dt_str, fmt)
-                        # Convert ET (UTC-5) to UTC
-                        from datetime import timedelta
-                        dt = dt.replace(tzinfo=timezone.utc) + timedelta(hours=5)
-                        return dt
-                    except ValueError:
-                        continue
-                # If time parsing fails, treat as start of day
-                dt = datetime.strptime(date_str, "%Y-%m-%d")
-                return dt.replace(hour=13, minute=0, tzinfo=timezone.utc)
-            else:
-                dt = datetime.strptime(date_str, "%Y-%m-%d")
-                return dt.replace(hour=13, minute=0, tzinfo=timezone.utc)
+                time_match = _TIME_RE.fullmatch(time_str.strip().upper())
+                if time_match is not None:
+                    hour, minute = int(time_match[1]), int(time_match[2])
+                    if 1 <= hour <= 12 and minute <= 59:
+                        hour = hour % 12 + (12 if time_match[3] == "PM" else 0)
+                        return datetime(year, month, day, hour, minute, tzinfo=timezone.utc) + _ET_OFFSET
+            # All-day, tentative or unparseable time: 13:00 UTC on the event date
+            return datetime(year, month, day, 13, 0, tzinfo=timezone.utc)
         except (ValueError, TypeError):
             return None
@@ -8,6 +8,17 @@ from app.instruments import INSTRUMENTS, InstrumentSpec, build_ibkr_contract, ge
 
 logger = logging.getLogger(__name__)
 
+# Account values reported by get_account_info
+_ACCOUNT_TAGS = frozenset({
+    "NetLiquidation", "TotalCashValue", "AvailableFunds",
+    "BuyingPower", "MaintMarginReq", "GrossPositionValue",
+})
+
+# (symbol, secType) -> instrument key; built in reverse so the first listed wins (EUR/CASH -> EURUSD)
+_INSTRUMENT_INDEX: dict[tuple[str, str], str] = {
+    (spec.symbol, spec.sec_type): key for key, spec in reversed(INSTRUMENTS.items())
+}
+
 
 class IBKRClient:
     def __init__(self, settings: Settings):
@@ -15,6 +26,15 @@ class IBKRClient:
         self._ib = IB()
         self._connected = False
         self._contracts: dict[str, Contract] = {}
+        # (symbol, secType, currency) -> instrument key for the qualified contracts
+        self._contract_index: dict[tuple[str, str, str], str] = {}
+        # Streaming market-data subscriptions, kept open and read on every get_price
+        self._tickers: dict = {}
+        # _ACCOUNT_TAGS values, kept current by accountValueEvent
+        self._account_values: dict[str, float] = {}
+        # (account, currency, modelCode) each tag is read from — the first one reported
+        self._account_value_keys: dict[str, tuple[str, str, str]] = {}
+        self._account_subscribed = False
 
     async def connect(self):
         """Connect to IB Gateway and qualify all instrument contracts."""
@@ -25,29 +45,51 @@ class IBKRClient:
             timeout=20,
         )
         self._connected = True
+        # Subscriptions don't survive a dropped connection
+        self._tickers.clear()
+        self._account_values.clear()
+        self._account_value_keys.clear()
+        if not self._account_subscribed:
+            self._ib.accountValueEvent += self._on_account_value
+            self._account_subscribed = True
 
         # Request delayed data as fallback when live data isn't subscribed
         self._ib.reqMarketDataType(4)  # 4 = delayed-frozen
 
         # Qualify all IBKR instrument contracts (skip non-IBKR instruments)
+        raws: dict[str, Contract] = {}
         for key, spec in INSTRUMENTS.items():
             raw = build_ibkr_contract(spec)
             if raw is None:
                 logger.info("Skipping %s — not an IBKR instrument (broker=%s)", key, spec.broker)
                 continue
-            try:
-                qualified = await self._ib.qualifyContractsAsync(raw)
-                if qualified and qualified[0] and qualified[0].conId:
-                    self._contracts[key] = qualified[0]
-                    logger.info("%s contract qualified: %s", key, qualified[0])
-                else:
-                    logger.warning("Failed to qualify %s contract — skipping", key)
-            except Exception as e:
-                logger.warning("Error qualifying %s contract: %s — skipping", key, e)
+            raws[key] = raw
+
+        # One request per contract, all in flight together over the same connection
+        results = await asyncio.gather(
+            *(self._ib.qualifyContractsAsync(raw) for raw in raws.values()),
+            return_exceptions=True,
+        )
+        for key, qualified in zip(raws, results):
+            if isinstance(qualified, Exception):
+                logger.warning("Error qualifying %s contract: %s — skipping", key, qualified)
+            elif qualified and qualified[0] and qualified[0].conId:
+                self._contracts[key] = qualified[0]
+                logger.info("%s contract qualified: %s", key, qualified[0])
+            else:
+                logger.warning("Failed to qualify %s contract — skipping", key)
 
         if not self._contracts:
             raise RuntimeError("Failed to qualify any instrument contracts")
 
+        self._contract_index = {
+            (c.symbol, c.secType, c.currency): key for key, c in reversed(self._contracts.items())
+        }
+
+        # Subscribe once per instrument; ticks then keep the Ticker objects current
+        for key, contract in self._contracts.items():
+            self._tickers[key] = self._ib.reqMktData(contract, genericTickList="", snapshot=False)
+
         logger.info(
             "Connected to IBKR Gateway at %s:%s (%d instruments)",
             self.settings.ibkr_host,
@@ -58,6 +100,9 @@ class IBKRClient:
     async def disconnect(self):
         """Disconnect from IB Gateway."""
         if self._connected:
+            for key in self._tickers:
+                self._ib.cancelMktData(self._contracts[key])
+            self._tickers.clear()
             self._ib.disconnect()
             self._connected = False
             logger.info("Disconnected from IBKR Gateway")
@@ -101,12 +146,15 @@ class IBKRClient:
         await self.ensure_connected()
         contract = self.get_contract(instrument_key)
         # Use streaming (not snapshot) — more reliable for forex and futures
-        ticker = self._ib.reqMktData(contract, genericTickList="", snapshot=False)
-        # Wait for data to arrive
+        ticker = self._tickers.get(instrument_key)
+        if ticker is None:
+            ticker = self._ib.reqMktData(contract, genericTickList="", snapshot=False)
+            self._tickers[instrument_key] = ticker
+        # Only waits until the subscription's first ticks have arrived
         for _ in range(100):  # 10 seconds max
-            await asyncio.sleep(0.1)
             if self._valid_price(ticker.bid) or self._valid_price(ticker.last):
                 break
+            await asyncio.sleep(0.1)
 
         bid = self._valid_price(ticker.bid) or self._valid_price(ticker.last)
         ask = self._valid_price(ticker.ask) or self._valid_price(ticker.last)
@@ -116,8 +164,6 @@ class IBKRClient:
         if last is None and bid and ask:
             last = (bid + ask) / 2
 
-        self._ib.cancelMktData(contract)
-
         return {
             "bid": bid or 0.0,
             "ask": ask or 0.0,
@@ -827,23 +873,18 @@ class IBKRClient:
 
     def _resolve_instrument_key(self, contract: Contract) -> str | None:
         """Map an IBKR contract back to our instrument key."""
-        for key, qualified in self._contracts.items():
-            if (
-                contract.symbol == qualified.symbol
-                and contract.secType == qualified.secType
-                and contract.currency == qualified.currency
-            ):
-                return key
+        key = self._contract_index.get((contract.symbol, contract.secType, contract.currency))
+        if key is not None:
+            return key
         # Fallback: match by symbol in INSTRUMENTS
-        for key, spec in INSTRUMENTS.items():
-            if contract.symbol == spec.symbol and contract.secType == spec.sec_type:
-                return key
-        return None
+        return _INSTRUMENT_INDEX.get((contract.symbol, contract.secType))
 
     async def get_account_info(self) -> dict:
         """Get account balance and margin info."""
         await self.ensure_connected()
         accounts = self._ib.managedAccounts()
+        if self._account_values:
+            return {**self._account_values, "accounts": accounts}
         logger.info("Managed accounts: %s", accounts)
 
         # Use cached account values (ib_async auto-subscribes on connect).
@@ -859,24 +900,38 @@ class IBKRClient:
             values = self._ib.accountValues()
 
         logger.info("Account values count: %d", len(values))
-        info = {}
-        target_tags = {"NetLiquidation", "TotalCashValue", "AvailableFunds",
-                       "BuyingPower", "MaintMarginReq", "GrossPositionValue"}
         for item in values:
-            if item.tag in target_tags and item.tag not in info:
-                info[item.tag] = float(item.value)
-        info["accounts"] = accounts
-        return info
+            self._on_account_value(item)
+        return {**self._account_values, "accounts": accounts}
+
+    def _on_account_value(self, value):
+        """Track a target tag, sticking to the first account/currency it was reported for."""
+        if value.tag not in _ACCOUNT_TAGS:
+            return
+        key = (value.account, value.currency, value.modelCode)
+        if self._account_value_keys.setdefault(value.tag, key) == key:
+            self._account_values[value.tag] = float(value.value)
 
     async def _wait_for_fill(self, trade: IBTrade, timeout: float = 30.0):
         """Wait for a trade to be filled or timeout."""
-        start = asyncio.get_event_loop().time()
-        while trade.orderStatus.status not in ("Filled", "Cancelled", "Inactive"):
-            await asyncio.sleep(0.1)
-            elapsed = asyncio.get_event_loop().time() - start
-            if elapsed > timeout:
-                logger.warning("Order fill timeout after %.1fs", timeout)
-                break
+        final_states = ("Filled", "Cancelled", "Inactive")
+        if trade.orderStatus.status in final_states:
+            return
+
+        # Resolved from ib_async's status callback instead of polling the order
+        done = asyncio.get_running_loop().create_future()
+
+        def on_status(updated: IBTrade):
+            if updated.orderStatus.status in final_states and not done.done():
+                done.set_result(None)
+
+        trade.statusEvent += on_status
+        try:
+            await asyncio.wait_for(done, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Order fill timeout after %.1fs", timeout)
+        finally:
+            trade.statusEvent -= on_status
 
     @staticmethod
     def _trade_to_dict(trade: IBTrade) -> dict:
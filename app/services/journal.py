@@ -1,7 +1,7 @@
 """Journal service for recording and analyzing AI trading analyses."""
 
-import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 
 from sqlalchemy import select, func as sa_func
@@ -17,17 +17,14 @@ class JournalService:
 
     async def record_analysis(self, db_session: AsyncSession, data: dict) -> AnalysisJournal:
         """Save an analysis entry to the journal."""
-        factors_json = json.dumps(data.get("factors", {})) if data.get("factors") else None
-        trade_idea_json = json.dumps(data.get("trade_idea", {})) if data.get("trade_idea") else None
-
         entry = AnalysisJournal(
             instrument=data["instrument"].upper(),
             direction=data["direction"].upper(),
             conviction=data.get("conviction"),
             total_score=data["total_score"],
-            factors=factors_json,
+            factors=data.get("factors") or None,
             reasoning=data.get("reasoning"),
-            trade_idea=trade_idea_json,
+            trade_idea=data.get("trade_idea") or None,
             source=data.get("source", "krabbe"),
             outcome="PENDING" if data["direction"] in ("BUY", "SELL") else "SKIPPED",
         )
@@ -71,16 +68,57 @@ class JournalService:
     ) -> list[AnalysisJournal]:
         """Retrieve journal entries with optional filters."""
         query = select(AnalysisJournal).order_by(AnalysisJournal.created_at.desc())
+        query = self._apply_filters(query, from_date, to_date, instrument)
+
+        result = await db_session.execute(query)
+        return list(result.scalars().all())
+
+    async def stream_journal(
+        self,
+        db_session: AsyncSession,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        instrument: str | None = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[AnalysisJournal]:
+        """Yield journal entries as they are read, without materializing the full list."""
+        query = select(AnalysisJournal).order_by(AnalysisJournal.created_at.desc())
+        query = self._apply_filters(query, from_date, to_date, instrument)
+
+        result = await db_session.stream_scalars(query.execution_options(yield_per=batch_size))
+        async for entry in result:
+            yield entry
+
+    async def get_journal_version(
+        self,
+        db_session: AsyncSession,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        instrument: str | None = None,
+    ) -> tuple:
+        """Cheap version token for a filtered journal listing.
 
+        Changes whenever an entry matching the filters is added or updated.
+        """
+        query = select(
+            sa_func.count(AnalysisJournal.id),
+            sa_func.max(AnalysisJournal.id),
+            sa_func.max(AnalysisJournal.updated_at),
+        )
+        query = self._apply_filters(query, from_date, to_date, instrument)
+
+        result = await db_session.execute(query)
+        return tuple(result.one())
+
+    @staticmethod
+    def _apply_filters(query, from_date: datetime | None, to_date: datetime | None, instrument: str | None):
         if from_date:
             query = query.where(AnalysisJournal.created_at >= from_date)
         if to_date:
             query = query.where(AnalysisJournal.created_at <= to_date)
         if instrument:
             query = query.where(AnalysisJournal.instrument == instrument.upper())
-
-        result = await db_session.execute(query)
-        return list(result.scalars().all())
+        return query
 
     async def get_journal_stats(self, db_session: AsyncSession) -> dict:
         """Calculate journal accuracy statistics.
@@ -44,7 +44,7 @@ class ScoringEngine:
     def score_bar(
         self,
         row: pd.Series,
-        macro_row: pd.Series | None,
+        macro_row: pd.Series | dict | None,
         instrument_key: str,
     ) -> dict:
         """Score a single daily bar using all available factors.
@@ -53,7 +53,7 @@ class ScoringEngine:
             row: Daily OHLCV bar with computed indicators
                  (sma20, sma50, sma200, rsi, atr, macd, macd_signal,
                   macd_hist, bb_upper, bb_lower, bb_mid, high_20, low_20).
-            macro_row: Macro data row aligned by date (may be None).
+            macro_row: Macro data row (Series or dict) aligned by date (may be None).
             instrument_key: Instrument key for correlation mapping.
 
         Returns:
@@ -356,7 +356,7 @@ class ScoringEngine:
         consensus = votes / count  # -1 to +1
         return round(max(-2.0, min(2.0, consensus * 2)), 2)
 
-    def _score_fundamental_1(self, macro_row: pd.Series | None, instrument_key: str) -> float:
+    def _score_fundamental_1(self, macro_row: pd.Series | dict | None, instrument_key: str) -> float:
         """Fundamental factor 1: primary macro indicator direction. Range: -2 to +2."""
         if macro_row is None:
             return 0.0
@@ -376,10 +376,11 @@ class ScoringEngine:
         ticker, correlation = primary
         change_col = f"{ticker}_change5"
 
-        if change_col not in macro_row.index or pd.isna(macro_row.get(change_col)):
+        change = macro_row.get(change_col)
+        if change is None or pd.isna(change):
             return 0.0
 
-        change = float(macro_row[change_col])
+        change = float(change)
 
         # Determine score based on change direction and correlation
         if abs(change) < 0.01:
@@ -397,7 +398,7 @@ class ScoringEngine:
 
         return max(-2.0, min(2.0, direction_score))
 
-    def _score_fundamental_2(self, macro_row: pd.Series | None, instrument_key: str) -> float:
+    def _score_fundamental_2(self, macro_row: pd.Series | dict | None, instrument_key: str) -> float:
         """Fundamental factor 2: secondary macro indicator. Range: -2 to +2."""
         if macro_row is None:
             return 0.0
@@ -417,10 +418,11 @@ class ScoringEngine:
         ticker, correlation = secondary
         change_col = f"{ticker}_change5"
 
-        if change_col not in macro_row.index or pd.isna(macro_row.get(change_col)):
+        change = macro_row.get(change_col)
+        if change is None or pd.isna(change):
             return 0.0
 
-        change = float(macro_row[change_col])
+        change = float(change)
 
         if abs(change) < 0.01:
             return 0.0
@@ -435,7 +437,7 @@ class ScoringEngine:
 
         return max(-2.0, min(2.0, direction_score))
 
-    def _score_fundamental_3(self, macro_row: pd.Series | None, instrument_key: str) -> float:
+    def _score_fundamental_3(self, macro_row: pd.Series | dict | None, instrument_key: str) -> float:
         """Fundamental factor 3: yield curve spread (10Y - 13W T-bill). Range: -2 to +2."""
         if macro_row is None:
             return 0.0
@@ -447,10 +449,11 @@ class ScoringEngine:
         correlation = correlations["yield_curve"]
         change_col = "yield_curve_change5"
 
-        if change_col not in macro_row.index or pd.isna(macro_row.get(change_col)):
+        change = macro_row.get(change_col)
+        if change is None or pd.isna(change):
             return 0.0
 
-        change = float(macro_row[change_col])
+        change = float(change)
 
         # Yield curve moves are smaller than DXY — use lower threshold
         if abs(change) < 0.005:
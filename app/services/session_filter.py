@@ -35,10 +35,11 @@ class SessionFilter:
                 return True, f"Warning: {instrument.key} weekend — low liquidity expected"
             return True, f"{instrument.key} trades 24/7"
 
-        # Check each session
-        for session in instrument.trading_sessions:
-            if self._hour_in_range(current_hour, session.start_hour_utc, session.end_hour_utc):
-                return True, f"{instrument.key} in {session.name} session ({session.start_hour_utc:02d}-{session.end_hour_utc:02d} UTC)"
+        # Precomputed hour mask answers open/closed; only walk the sessions for the name
+        if instrument.in_session_hour(current_hour):
+            for session in instrument.trading_sessions:
+                if self._hour_in_range(current_hour, session.start_hour_utc, session.end_hour_utc):
+                    return True, f"{instrument.key} in {session.name} session ({session.start_hour_utc:02d}-{session.end_hour_utc:02d} UTC)"
 
         session_names = ", ".join(
             f"{s.name} ({s.start_hour_utc:02d}-{s.end_hour_utc:02d} UTC)"
@@ -206,8 +206,8 @@ class TechnicalAnalyzer:
         self._macro_service = MacroDataService()
         self._scoring_engine = ScoringEngine()
         self._intraday_scoring_engine = IntradayScoringEngine()
-        from app.config import Settings
-        _settings = Settings()
+        from app.config import load_settings
+        _settings = load_settings()
         self._m5_scalp_scoring_engine = M5ScalpScoringEngine(
             signal_threshold=_settings.m5_signal_threshold,
             high_conviction_threshold=_settings.m5_high_conviction_threshold,
@@ -222,9 +222,17 @@ class TechnicalAnalyzer:
         )
         self._ny_orb_scoring_engine = NYORBScoringEngine(tp_sl_ratio=2.0)
         self._m15_sensei_scoring_engine = M15SenseiScoringEngine()
-        self._calendar_service = CalendarService()
+        self._calendar_service = CalendarService(cache_path=_settings.calendar_cache_path or None)
         self._news_service = NewsService()
 
+    def start(self):
+        """Start background refreshers (calendar prefetch)."""
+        self._calendar_service.start()
+
+    async def aclose(self):
+        """Stop background refreshers and close HTTP clients held by the calendar service."""
+        await self._calendar_service.aclose()
+
     async def analyze(self, instrument_key: str) -> dict:
         """Full multi-timeframe analysis for a single instrument."""
         key = instrument_key.upper()
@@ -20,6 +20,7 @@ from telegram.ext import Application, CommandHandler, ContextTypes
 from app.config import Settings
 from app.instruments import INSTRUMENTS
 from app.models.trade import Trade, TradeStatus
+from app.services.analytics import analytics_cache
 from app.services.ibkr_client import IBKRClient
 from app.services.icmarkets_client import ICMarketsClient
 
@@ -350,6 +351,7 @@ class TelegramCommandHandler:
                 trade.pnl = pnl
                 trade.closed_at = datetime.now(timezone.utc)
                 await session.commit()
+                analytics_cache.clear()
 
         # Clean up ratchet state
         ratchet_file = Path(os.environ.get("JOURNAL_DIR", "/app/journal")) / "monitors" / f"ratchet_{instrument_key}_{direction}.json"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 
@@ -224,7 +225,8 @@ class TradeExecutor:
 
         # ATR-based SL/TP defaults if user didn't specify distances
         if (stop_distance is None or limit_distance is None) and self.atr_calculator is not None:
-            atr_result = self.atr_calculator.get_dynamic_sl_tp(instrument)
+            # May hit yfinance on a cache miss — keep it off the event loop
+            atr_result = await asyncio.to_thread(self.atr_calculator.get_dynamic_sl_tp, instrument)
             if atr_result is not None:
                 atr_sl, atr_tp = atr_result
                 if stop_distance is None:
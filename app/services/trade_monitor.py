@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.config import Settings
 from app.instruments import INSTRUMENTS
 from app.models.trade import Trade, TradeStatus
+from app.services.analytics import analytics_cache
 from app.services.ibkr_client import IBKRClient
 from app.services.icmarkets_client import ICMarketsClient
 from app.services.telegram_notifier import TelegramNotifier
@@ -174,6 +175,7 @@ class TradeCloseMonitor:
             db_trade.pnl = round(pnl, 2)
             db_trade.closed_at = now
             await session.commit()
+        analytics_cache.clear()
 
         logger.info(
             "Trade #%d CLOSED: %s %s — P&L: €%.2f — Duration: %s",
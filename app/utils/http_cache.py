@@ -0,0 +1,17 @@
+import hashlib
+
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the repr of cheap version parts."""
+    return '"' + hashlib.md5(repr(parts).encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header covers etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
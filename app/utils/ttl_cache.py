@@ -0,0 +1,54 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire after a fixed TTL (monotonic clock)."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl = ttl_seconds
+        self._entries: dict[Hashable, tuple[Any, float]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, ts = entry
+        if time.monotonic() - ts >= self.ttl:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (value, time.monotonic())
+
+    def clear(self):
+        self._entries.clear()
+        # Results of computations already running predate the clear — don't cache them
+        self._inflight.clear()
+        self._generation += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, or run ``compute()`` once for all concurrent callers of ``key``."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(key, compute, self._generation))
+            self._inflight[key] = future
+        # Shield so one caller going away doesn't cancel the others' result
+        return await asyncio.shield(future)
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await compute()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if generation == self._generation:
+            self.set(key, value)
+        return value
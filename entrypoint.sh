@@ -37,4 +37,7 @@ chmod 0644 /etc/cron.d/gold-trader
 cron
 
 echo "Starting gold-trader (AUDUSD M5 Scalp on IC Markets)..."
-exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8001
+# uvloop + httptools ship with uvicorn[standard]; pin them so a missing wheel
+# fails at startup instead of silently falling back to asyncio/h11.
+# Single worker: each worker would open its own IBKR client and trade monitor.
+exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8001 --loop uvloop --http httptools
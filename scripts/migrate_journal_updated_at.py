@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Idempotent SQLite migration adding updated_at to the analysis_journal table."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+DB_PATH = Path(__file__).resolve().parent.parent / "trades.db"
+
+NEW_COLUMNS = [
+    ("updated_at", "TIMESTAMP"),
+]
+
+
+def migrate(db_path: Path = DB_PATH) -> None:
+    if not db_path.exists():
+        print(f"Database not found at {db_path} — nothing to migrate (tables will be created on startup)")
+        return
+
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+
+    # Get existing columns
+    cursor.execute("PRAGMA table_info(analysis_journal)")
+    existing = {row[1] for row in cursor.fetchall()}
+
+    added = []
+    for col_name, col_type in NEW_COLUMNS:
+        if col_name not in existing:
+            cursor.execute(f"ALTER TABLE analysis_journal ADD COLUMN {col_name} {col_type}")
+            added.append(col_name)
+
+    conn.commit()
+    conn.close()
+
+    if added:
+        print(f"Migration complete — added columns: {', '.join(added)}")
+    else:
+        print("Migration: all columns already exist, nothing to do")
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    migrate(path)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Idempotent SQLite migration adding composite indexes on the trades table."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+DB_PATH = Path(__file__).resolve().parent.parent / "trades.db"
+
+INDEXES = [
+    ("ix_trades_epic_direction_status_id", "epic, direction, status, id"),
+    ("ix_trades_status_closed_at", "status, closed_at"),
+    ("ix_trades_status_epic_closed_at", "status, epic, closed_at"),
+]
+
+
+def migrate(db_path: Path = DB_PATH) -> None:
+    if not db_path.exists():
+        print(f"Database not found at {db_path} — nothing to migrate (tables will be created on startup)")
+        return
+
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+
+    # Get existing indexes
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='trades'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    added = []
+    for index_name, columns in INDEXES:
+        if index_name not in existing:
+            cursor.execute(f"CREATE INDEX {index_name} ON trades ({columns})")
+            added.append(index_name)
+
+    conn.commit()
+    conn.close()
+
+    if added:
+        print(f"Migration complete — added indexes: {', '.join(added)}")
+    else:
+        print("Migration: all indexes already exist, nothing to do")
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    migrate(path)
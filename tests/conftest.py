@@ -31,6 +31,7 @@ def settings():
         conviction_sizing_enabled=True,
         partial_tp_enabled=True,
         max_position_size=0,  # no cap in tests
+        backtest_cache_dir="",  # every test patches yfinance with its own data
     )
 
 
@@ -81,6 +82,8 @@ def mock_ibkr_client():
         "dealId": "1",
     }
     client.get_open_positions.return_value = []
+    client.get_open_orders.return_value = []
+    client.get_pending_orders.return_value = []
     client.get_account_info.return_value = {
         "NetLiquidation": 10000.0,
         "TotalCashValue": 10000.0,
@@ -156,7 +159,7 @@ def mock_journal_service():
     service = AsyncMock()
     service.record_analysis.return_value = MagicMock(
         id=1, instrument="XAUUSD", direction="BUY", conviction="HIGH",
-        total_score=16.5, factors='{}', reasoning="Test", trade_idea=None,
+        total_score=16.5, factors={}, reasoning="Test", trade_idea=None,
         source="krabbe", linked_trade_id=None, outcome="PENDING",
         outcome_notes=None, created_at=None,
     )
@@ -170,7 +173,7 @@ def mock_journal_service():
 
 
 @pytest_asyncio.fixture
-async def test_app(settings, mock_ibkr_client, mock_atr_calculator):
+async def test_app(settings, mock_ibkr_client, mock_atr_calculator, mock_notifier):
     """Create a test FastAPI app with mocked dependencies."""
     os.environ.update({
         "IBKR_HOST": settings.ibkr_host,
@@ -182,13 +185,17 @@ async def test_app(settings, mock_ibkr_client, mock_atr_calculator):
         "DATABASE_URL": settings.database_url,
     })
 
+    from app.dependencies import ServiceRegistry
     from app.main import app
 
     # Override the lifespan by setting state directly
     app.state.settings = settings
+    app.state.services = ServiceRegistry.build(settings)
     app.state.ibkr_client = mock_ibkr_client
     app.state.ibkr_connected = True
     app.state.atr_calculator = mock_atr_calculator
+    app.state.telegram_notifier = mock_notifier
+    app.state.telegram_handler = None
 
     # IC Markets mock client
     mock_icm_client = AsyncMock()
@@ -203,6 +210,8 @@ async def test_app(settings, mock_ibkr_client, mock_atr_calculator):
 
     from app.services.technical_analyzer import TechnicalAnalyzer
     app.state.technical_analyzer = TechnicalAnalyzer()
+    # Default thread executor — keeps yfinance patches visible to backtests
+    app.state.backtest_pool = None
 
     engine = create_async_engine(settings.database_url)
     async with engine.begin() as conn:
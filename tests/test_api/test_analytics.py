@@ -37,6 +37,15 @@ async def test_analytics_with_date_params(client):
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_analytics_rejects_malformed_date(client):
+    response = await client.get(
+        "/api/v1/analytics?from_date=not-a-date",
+        headers={"X-API-Key": "test_secret"},
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_analytics_with_instrument_filter(client):
     response = await client.get(
@@ -81,3 +90,32 @@ async def test_analytics_response_shape(client):
         "daily_pnl", "weekly_pnl", "monthly_pnl",
     }
     assert expected_keys.issubset(data.keys())
+
+
+@pytest.mark.asyncio
+async def test_analytics_cached_until_trade_closed(client, test_app):
+    from datetime import datetime, timezone
+
+    from app.models.trade import Trade, TradeStatus
+    from app.services.analytics import analytics_cache
+
+    analytics_cache.clear()
+    headers = {"X-API-Key": "test_secret"}
+    first = await client.get("/api/v1/analytics?strategy=cache_test", headers=headers)
+    assert first.json()["total_trades"] == 0
+
+    async with test_app.state.async_session() as session:
+        session.add(Trade(
+            direction="BUY", epic="XAUUSD", size=1.0, entry_price=2900.0,
+            status=TradeStatus.CLOSED, pnl=50.0, strategy="cache_test",
+            closed_at=datetime.now(timezone.utc),
+        ))
+        await session.commit()
+
+    cached = await client.get("/api/v1/analytics?strategy=cache_test", headers=headers)
+    assert cached.json()["total_trades"] == 0
+
+    analytics_cache.clear()
+    fresh = await client.get("/api/v1/analytics?strategy=cache_test", headers=headers)
+    assert fresh.json()["total_trades"] == 1
+    analytics_cache.clear()
@@ -100,3 +100,36 @@ async def test_backtest_response_shape(client):
         "trades", "equity_curve", "monthly_breakdown",
     }
     assert expected_keys.issubset(data.keys())
+
+
+@pytest.mark.asyncio
+async def test_backtest_runs_in_process_pool(client, test_app, settings, tmp_path):
+    """The production pool (spawned workers) can pickle and run a backtest."""
+    from app.main import create_backtest_pool
+    from app.services.backtester import Backtester
+
+    # Warm the on-disk history cache here; the worker can't see yfinance patches
+    mock_ticker = MagicMock()
+    mock_ticker.history.return_value = _mock_ohlc_data()
+    with patch("app.services.backtester.yf.Ticker", return_value=mock_ticker):
+        expected = Backtester(cache_dir=str(tmp_path)).run(instrument_key="XAUUSD", strategy="sma_crossover")
+
+    test_app.state.settings = settings.model_copy(update={"backtest_cache_dir": str(tmp_path)})
+    pool = create_backtest_pool(test_app.state.settings)
+    test_app.state.backtest_pool = pool
+    try:
+        with patch("app.services.backtester.yf.Ticker", side_effect=AssertionError("cache miss")):
+            response = await client.post(
+                "/api/v1/backtest",
+                json={"instrument": "XAUUSD", "strategy": "sma_crossover"},
+                headers={"X-API-Key": "test_secret"},
+            )
+    finally:
+        pool.shutdown()
+        test_app.state.settings = settings
+        test_app.state.backtest_pool = None
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_trades"] == expected["total_trades"]
+    assert data["final_balance"] == expected["final_balance"]
@@ -14,3 +14,14 @@ async def test_health_returns_ok(client):
     assert "XAUUSD" in keys
     assert "MES" in keys
     assert "EURUSD" in keys
+
+
+@pytest.mark.asyncio
+async def test_health_returns_304_for_matching_etag(client):
+    first = await client.get("/health")
+    etag = first.headers["etag"]
+
+    response = await client.get("/health", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
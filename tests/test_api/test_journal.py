@@ -142,6 +142,29 @@ class TestJournalAPI:
         assert len(data) == 1
         assert data[0]["instrument"] == "XAUUSD"
 
+    @pytest.mark.asyncio
+    async def test_list_returns_304_until_entries_change(self, journal_client):
+        """GET /api/v1/journal should honour If-None-Match until an entry changes."""
+        resp = await journal_client.post(
+            "/api/v1/journal",
+            headers=HEADERS,
+            json={"instrument": "XAUUSD", "direction": "BUY", "total_score": 15.0},
+        )
+        entry_id = resp.json()["id"]
+
+        resp = await journal_client.get("/api/v1/journal", headers=HEADERS)
+        etag = resp.headers["etag"]
+
+        resp = await journal_client.get("/api/v1/journal", headers={**HEADERS, "If-None-Match": etag})
+        assert resp.status_code == 304
+
+        await journal_client.patch(f"/api/v1/journal/{entry_id}?outcome=WIN", headers=HEADERS)
+
+        resp = await journal_client.get("/api/v1/journal", headers={**HEADERS, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()[0]["outcome"] == "WIN"
+        assert resp.headers["etag"] != etag
+
     @pytest.mark.asyncio
     async def test_get_journal_stats(self, journal_client):
         """GET /api/v1/journal/stats should return stats."""
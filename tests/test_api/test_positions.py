@@ -154,6 +154,38 @@ async def test_modify_no_open_orders_returns_404(mock_bot_cls, client, mock_ibkr
     assert "stop-loss" in response.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+async def test_modify_persists_new_sl_to_latest_trade(client, test_app, mock_ibkr_client):
+    from sqlalchemy import select
+
+    from app.models.trade import Trade, TradeStatus
+
+    async with test_app.state.async_session() as session:
+        trade = Trade(direction="BUY", epic="XAUUSD", size=1.0, entry_price=2900.0,
+                      stop_loss=2850.0, take_profit=2950.0, status=TradeStatus.EXECUTED)
+        session.add(trade)
+        await session.commit()
+
+    mock_ibkr_client.modify_sl_tp.return_value = {
+        "old_sl": 2850.0,
+        "old_tp": 2950.0,
+        "new_sl": 2900.0,
+        "new_tp": None,
+    }
+
+    response = await client.post(
+        "/api/v1/positions/modify",
+        json={"instrument": "XAUUSD", "direction": "BUY", "new_stop_loss": 2900.0},
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+
+    async with test_app.state.async_session() as session:
+        stored = (await session.execute(select(Trade).where(Trade.id == trade.id))).scalar_one()
+    assert stored.stop_loss == 2900.0
+    assert stored.take_profit == 2950.0
+
+
 # --- Trade Status tests ---
 
 
@@ -212,3 +244,116 @@ async def test_status_returns_all_sections(client, mock_ibkr_client):
     assert pos["take_profit"] == 2950.0
     assert pos["unrealized_pnl"] is not None
     assert pos["current_price"] is not None
+
+
+@pytest.mark.asyncio
+async def test_status_tolerates_price_fetch_failure(client, mock_ibkr_client):
+    mock_ibkr_client.get_open_positions.return_value = [
+        {
+            "instrument": "XAUUSD",
+            "symbol": "XAUUSD",
+            "size": 1.0,
+            "direction": "BUY",
+            "avg_cost": 2900.0,
+            "unrealized_pnl": None,
+            "size_unit": "oz",
+        }
+    ]
+    mock_ibkr_client.get_open_orders.return_value = []
+    mock_ibkr_client.get_price.side_effect = RuntimeError("No market data")
+
+    response = await client.get(
+        "/api/v1/positions/status",
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+    pos = response.json()["positions"][0]
+    assert pos["stop_loss"] is None
+    assert "current_price" not in pos
+
+
+@pytest.mark.asyncio
+async def test_status_pending_orders_include_sl_tp(client, mock_ibkr_client):
+    mock_ibkr_client.get_open_positions.return_value = []
+    mock_ibkr_client.get_open_orders.return_value = []
+    mock_ibkr_client.get_pending_orders.return_value = [
+        {
+            "orderId": 20,
+            "orderType": "LMT",
+            "action": "BUY",
+            "totalQuantity": 1.0,
+            "entryPrice": 2880.0,
+            "status": "Submitted",
+            "instrument": "XAUUSD",
+            "children": [
+                {"orderId": 21, "orderType": "STP", "auxPrice": 2850.0, "lmtPrice": None},
+                {"orderId": 22, "orderType": "LMT", "auxPrice": None, "lmtPrice": 2950.0},
+            ],
+        }
+    ]
+
+    response = await client.get(
+        "/api/v1/positions/status",
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+    po = response.json()["pending_orders"][0]
+    assert po["order_type"] == "LIMIT"
+    assert po["entry_price"] == 2880.0
+    assert po["stop_loss"] == 2850.0
+    assert po["take_profit"] == 2950.0
+
+
+# --- Close position tests ---
+
+
+@pytest.mark.asyncio
+async def test_close_position_notifies_via_shared_notifier(client, mock_ibkr_client, mock_notifier):
+    mock_ibkr_client.get_open_positions.return_value = [
+        {"instrument": "XAUUSD", "direction": "BUY", "size": 1.0, "avg_cost": 2900.0}
+    ]
+    mock_ibkr_client.close_position.return_value = {"status": "Filled", "fillPrice": 2950.0, "pnl": 50.0}
+
+    response = await client.post(
+        "/api/v1/positions/close",
+        json={"instrument": "XAUUSD", "direction": "BUY"},
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "closed"
+    assert data["pnl"] == 50.0
+    # Sent as a background task once the response has been returned
+    mock_notifier.send_message.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_close_position_marks_latest_executed_trade_closed(client, test_app, mock_ibkr_client):
+    from sqlalchemy import select
+
+    from app.models.trade import Trade, TradeStatus
+
+    async with test_app.state.async_session() as session:
+        older = Trade(direction="BUY", epic="XAUUSD", size=1.0, entry_price=2890.0, status=TradeStatus.EXECUTED)
+        newer = Trade(direction="BUY", epic="XAUUSD", size=1.0, entry_price=2900.0, status=TradeStatus.EXECUTED)
+        session.add_all([older, newer])
+        await session.commit()
+
+    mock_ibkr_client.get_open_positions.return_value = [
+        {"instrument": "XAUUSD", "direction": "BUY", "size": 1.0, "avg_cost": 2900.0}
+    ]
+    mock_ibkr_client.close_position.return_value = {"status": "Filled", "fillPrice": 2950.0, "pnl": 50.0}
+
+    response = await client.post(
+        "/api/v1/positions/close",
+        json={"instrument": "XAUUSD", "direction": "BUY"},
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+
+    async with test_app.state.async_session() as session:
+        rows = {t.id: t for t in (await session.execute(select(Trade))).scalars()}
+    assert rows[newer.id].status == TradeStatus.CLOSED
+    assert rows[newer.id].pnl == 50.0
+    assert rows[newer.id].closed_at is not None
+    assert rows[older.id].status == TradeStatus.EXECUTED
@@ -0,0 +1,24 @@
+import pytest
+from unittest.mock import AsyncMock
+
+
+@pytest.mark.asyncio
+async def test_webhook_without_handler_returns_503(client, test_app):
+    test_app.state.telegram_handler = None
+    response = await client.post("/webhook/telegram", json={"update_id": 1})
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_webhook_passes_update_to_handler(client, test_app):
+    handler = AsyncMock()
+    test_app.state.telegram_handler = handler
+    try:
+        response = await client.post(
+            "/webhook/telegram",
+            json={"update_id": 7, "message": {"text": "/status"}},
+        )
+    finally:
+        test_app.state.telegram_handler = None
+    assert response.status_code == 200
+    handler.process_update.assert_awaited_once_with({"update_id": 7, "message": {"text": "/status"}})
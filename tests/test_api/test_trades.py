@@ -22,6 +22,23 @@ async def test_submit_trade_rejects_invalid_api_key(client):
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_submit_trade_rejects_bad_key_before_opening_db_session(client, test_app):
+    from unittest.mock import MagicMock
+
+    session_factory = test_app.state.async_session
+    test_app.state.async_session = MagicMock(side_effect=AssertionError("session opened"))
+    try:
+        response = await client.post(
+            "/api/v1/trades/submit",
+            json={"direction": "BUY", "stop_distance": 50, "limit_distance": 100},
+            headers={"X-API-Key": "wrong_key"},
+        )
+    finally:
+        test_app.state.async_session = session_factory
+    assert response.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_submit_trade_invalid_direction(client):
     response = await client.post(
@@ -77,3 +94,75 @@ async def test_submit_trade_with_instrument(mock_bot_cls, client, mock_ibkr_clie
     data = response.json()
     assert data["instrument"] == "XAUUSD"
     assert data["direction"] == "SELL"
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_notifies_via_shared_notifier(client, mock_ibkr_client, mock_notifier):
+    mock_ibkr_client.cancel_order.return_value = {"success": True}
+
+    response = await client.post(
+        "/api/v1/trades/cancel",
+        json={"instrument": "XAUUSD", "direction": "BUY", "order_id": 42},
+        headers={"X-API-Key": "test_secret"},
+    )
+    assert response.status_code == 200
+    assert response.json()["cancelled_order_ids"] == [42]
+    mock_notifier.send_cancel_update.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_marks_pending_trades_cancelled(client, test_app, mock_ibkr_client):
+    from sqlalchemy import select
+
+    from app.models.trade import Trade, TradeStatus
+
+    async with test_app.state.async_session() as session:
+        first = Trade(direction="BUY", epic="XAUUSD", size=1.0, deal_id="101", status=TradeStatus.PENDING_ORDER)
+        second = Trade(direction="BUY", epic="XAUUSD", size=1.0, deal_id="102", status=TradeStatus.PENDING_ORDER)
+        other = Trade(direction="BUY", epic="XAUUSD", size=1.0, deal_id="103", status=TradeStatus.PENDING_ORDER)
+        session.add_all([first, second, other])
+        await session.commit()
+
+    mock_ibkr_client.get_pending_orders.return_value = [
+        {"orderId": 101, "action": "BUY"},
+        {"orderId": 102, "action": "BUY"},
+    ]
+    mock_ibkr_client.cancel_order.return_value = {"success": True}
+
+    response = await client.post(
+        "/api/v1/trades/cancel",
+        json={"instrument": "XAUUSD", "direction": "BUY"},
+        headers={"X-API-Key": "test_secret"},
+    )
+    assert response.status_code == 200
+    assert response.json()["cancelled_order_ids"] == [101, 102]
+
+    async with test_app.state.async_session() as session:
+        rows = {t.deal_id: t.status for t in (await session.execute(select(Trade))).scalars()}
+    assert rows == {
+        "101": TradeStatus.CANCELLED,
+        "102": TradeStatus.CANCELLED,
+        "103": TradeStatus.PENDING_ORDER,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_skips_failed_cancellations(client, mock_ibkr_client):
+    mock_ibkr_client.get_pending_orders.return_value = [
+        {"orderId": 201, "action": "SELL"},
+        {"orderId": 202, "action": "SELL"},
+        {"orderId": 203, "action": "SELL"},
+    ]
+    mock_ibkr_client.cancel_order.side_effect = [
+        {"success": True},
+        RuntimeError("IB Gateway disconnected"),
+        {"success": False, "error": "Order 203 not found"},
+    ]
+
+    response = await client.post(
+        "/api/v1/trades/cancel",
+        json={"instrument": "XAUUSD", "direction": "SELL"},
+        headers={"X-API-Key": "test_secret"},
+    )
+    assert response.status_code == 200
+    assert response.json()["cancelled_order_ids"] == [201]
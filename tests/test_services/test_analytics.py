@@ -155,3 +155,108 @@ async def test_filter_by_date_range(analytics, db_session):
     future = datetime.now(timezone.utc) + timedelta(days=1)
     result = await analytics.calculate(db_session, from_date=future)
     assert result["total_trades"] == 0
+
+
+@pytest.mark.asyncio
+async def test_per_conviction_and_strategy_breakdown(analytics, db_session):
+    base_time = datetime.now(timezone.utc) - timedelta(days=5)
+    for i, (pnl, conviction, strategy) in enumerate([
+        (100.0, "HIGH", "intraday"),
+        (-40.0, "HIGH", "intraday"),
+        (60.0, None, "m5_scalp"),
+        (-20.0, "LOW", None),
+    ]):
+        db_session.add(Trade(
+            direction="BUY", epic="XAUUSD", size=1.0, status=TradeStatus.CLOSED,
+            pnl=pnl, conviction=conviction, strategy=strategy,
+            closed_at=base_time + timedelta(hours=i),
+        ))
+    await db_session.commit()
+
+    result = await analytics.calculate(db_session)
+    assert result["per_conviction"]["HIGH"] == {
+        "total_trades": 2, "winning_trades": 1, "win_rate": 50.0, "total_pnl": 60.0,
+    }
+    assert result["per_conviction"]["UNKNOWN"]["total_pnl"] == 60.0
+    assert result["per_strategy"]["intraday"]["total_trades"] == 2
+    assert result["per_strategy"]["unknown"]["total_pnl"] == -20.0
+    assert result["total_pnl"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_time_buckets_across_iso_year_boundary(analytics, db_session):
+    # 2024-12-30 falls in ISO week 1 of 2025
+    for pnl, closed_at in [
+        (10.0, datetime(2024, 12, 28, 9)),
+        (20.0, datetime(2024, 12, 30, 9)),
+        (-5.0, datetime(2024, 12, 30, 15)),
+        (7.0, datetime(2025, 1, 2, 9)),
+    ]:
+        db_session.add(Trade(
+            direction="BUY", epic="XAUUSD", size=1.0, status=TradeStatus.CLOSED,
+            pnl=pnl, closed_at=closed_at,
+        ))
+    await db_session.commit()
+
+    result = await analytics.calculate(db_session)
+    assert result["daily_pnl"] == [
+        {"period": "2024-12-28", "pnl": 10.0},
+        {"period": "2024-12-30", "pnl": 15.0},
+        {"period": "2025-01-02", "pnl": 7.0},
+    ]
+    assert result["weekly_pnl"] == [
+        {"period": "2024-W52", "pnl": 10.0},
+        {"period": "2025-W01", "pnl": 22.0},
+    ]
+    assert result["monthly_pnl"] == [
+        {"period": "2024-12", "pnl": 25.0},
+        {"period": "2025-01", "pnl": 7.0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_coalesces_concurrent_computations():
+    import asyncio
+
+    from app.utils.ttl_cache import TTLCache
+
+    cache = TTLCache(ttl_seconds=30)
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"total_trades": calls}
+
+    waiters = [asyncio.create_task(cache.get_or_compute("key", compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(r == {"total_trades": 1} for r in results)
+    assert cache.get("key") == {"total_trades": 1}
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_discards_result_computed_across_clear():
+    import asyncio
+
+    from app.utils.ttl_cache import TTLCache
+
+    cache = TTLCache(ttl_seconds=30)
+    release = asyncio.Event()
+
+    async def compute():
+        await release.wait()
+        return "stale"
+
+    pending = asyncio.create_task(cache.get_or_compute("key", compute))
+    await asyncio.sleep(0)
+    cache.clear()
+    release.set()
+
+    assert await pending == "stale"
+    assert cache.get("key") is None
@@ -101,3 +101,48 @@ def test_clamping_to_bounds(atr_calc):
         sl, tp = result
         assert sl <= instrument.max_stop_distance
         assert sl >= instrument.min_stop_distance
+
+
+def test_prefetch_warms_cache_from_one_batch_download(atr_calc):
+    xau = get_instrument("XAUUSD")
+    mes = get_instrument("MES")
+    raw = pd.concat(
+        {xau.yahoo_symbol: _mock_history(), mes.yahoo_symbol: _mock_history(high_base=5010, low_base=4990, close_base=5000)},
+        axis=1,
+    )
+
+    with patch("app.services.atr_calculator.yf.download", return_value=raw) as mock_download:
+        warmed = atr_calc.prefetch([xau, mes])
+
+    assert warmed == 2
+    mock_download.assert_called_once()
+    with patch("app.services.atr_calculator.yf.Ticker") as mock_ticker_cls:
+        assert atr_calc.get_dynamic_sl_tp(xau) is not None
+        assert atr_calc.get_dynamic_sl_tp(mes) is not None
+    mock_ticker_cls.assert_not_called()
+
+
+def test_concurrent_misses_share_one_fetch(atr_calc):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    instrument = get_instrument("XAUUSD")
+    release = threading.Event()
+    mock_ticker = MagicMock()
+
+    def slow_history(**kwargs):
+        release.wait(timeout=5)
+        return _mock_history()
+
+    mock_ticker.history.side_effect = slow_history
+
+    with patch("app.services.atr_calculator.yf.Ticker", return_value=mock_ticker):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(atr_calc.get_dynamic_sl_tp, instrument) for _ in range(8)]
+            time.sleep(0.1)
+            release.set()
+            results = [f.result() for f in futures]
+
+    assert mock_ticker.history.call_count == 1
+    assert all(r == results[0] for r in results)
+    assert results[0] is not None
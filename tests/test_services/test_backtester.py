@@ -4,7 +4,7 @@ from unittest.mock import patch, MagicMock
 import pandas as pd
 import numpy as np
 
-from app.services.backtester import Backtester
+from app.services.backtester import Backtester, _scan_exit
 from app.services.scoring_engine import ScoringEngine
 
 
@@ -247,3 +247,112 @@ def test_compute_indicators_includes_macd_bollinger(backtester):
     # Values should be computed (not all NaN after warmup)
     assert not df["macd"].iloc[-1:].isna().all()
     assert not df["bb_upper"].iloc[-1:].isna().all()
+
+
+def test_history_cache_reuses_download_across_runs(tmp_path):
+    mock_ticker = MagicMock()
+    mock_ticker.history.return_value = _mock_ohlc_data(num_bars=200)
+
+    with patch("app.services.backtester.yf.Ticker", return_value=mock_ticker):
+        first = Backtester(cache_dir=str(tmp_path)).run(instrument_key="XAUUSD", strategy="sma_crossover")
+        second = Backtester(cache_dir=str(tmp_path)).run(instrument_key="XAUUSD", strategy="sma_crossover")
+        # A different period is a different cache entry
+        Backtester(cache_dir=str(tmp_path)).run(instrument_key="XAUUSD", strategy="sma_crossover", period="2y")
+
+    assert mock_ticker.history.call_count == 2
+    assert second == first
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+
+def test_run_batch_returns_results_in_config_order(backtester):
+    from concurrent.futures import ThreadPoolExecutor
+
+    mock_ticker = MagicMock()
+    mock_ticker.history.return_value = _mock_ohlc_data(num_bars=200)
+    configs = [
+        {"instrument_key": "XAUUSD", "strategy": "sma_crossover"},
+        {"instrument_key": "NOPE", "strategy": "sma_crossover"},
+        {"instrument_key": "XAUUSD", "strategy": "breakout", "risk_percent": 1.0},
+    ]
+
+    with patch("app.services.backtester.yf.Ticker", return_value=mock_ticker), ThreadPoolExecutor(2) as pool:
+        results = backtester.run_batch(configs, executor=pool)
+
+    assert [r.get("strategy") for r in results] == ["sma_crossover", None, "breakout"]
+    assert "error" in results[1]
+
+
+def test_compute_indicators_reuses_result_for_identical_data(backtester):
+    from app.services.indicators import compute_indicators
+
+    df = _mock_ohlc_data(num_bars=120)
+    df["close"] += 0.125  # keep this frame distinct from other tests' data
+
+    with patch("app.services.indicators.compute_indicators", wraps=compute_indicators) as spy:
+        first = backtester._compute_indicators(df.copy())
+        second = backtester._compute_indicators(df.copy())
+
+    assert spy.call_count == 1
+    assert first is not second
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_scan_exit_fixed_tp_and_sl_priority():
+    highs = np.array([100.0, 104.0, 111.0])
+    lows = np.array([100.0, 99.0, 94.0])
+    # BUY at 100, SL 95, TP 110: bar 2 touches both — SL is checked first
+    assert _scan_exit(highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, False, False) == (2, 95.0, "sl", 95.0, False)
+    # With partial TP: bar 1 reaches 1R (105), bar 2 hits TP once the low holds above SL
+    lows[2] = 96.0
+    assert _scan_exit(highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, True, False) == (2, 110.0, "tp", 95.0, True)
+
+
+def test_scan_exit_runner_trails_stop_behind_peak():
+    highs = np.array([100.0, 106.0, 112.0, 111.0])
+    lows = np.array([100.0, 101.0, 108.0, 106.5])
+    # BUY at 100, 1R = 5: TP1 on bar 1, then the peak of 112 trails the SL up to 107
+    exit_idx, exit_price, reason, sl_price, partial = _scan_exit(
+        highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, True, True,
+    )
+    assert (exit_idx, exit_price, reason, sl_price, partial) == (3, 107.0, "trailing_sl", 107.0, True)
+
+
+def test_scan_exit_fixed_levels_found_past_first_block():
+    highs = np.full(200, 101.0)
+    lows = np.full(200, 99.0)
+    highs[150] = 111.0  # 1R (105) and TP (110) first reached on the same bar
+    assert _scan_exit(highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, True, False) == (150, 110.0, "tp", 95.0, True)
+    # SL on that bar instead: the 1R touch no longer counts
+    lows[150] = 94.0
+    assert _scan_exit(highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, True, False) == (150, 95.0, "sl", 95.0, False)
+
+
+def test_scan_exit_keeps_partial_fill_from_an_earlier_block(monkeypatch):
+    import app.services.backtester as backtester
+
+    highs = np.full(300, 101.0)
+    lows = np.full(300, 99.0)
+    highs[30] = 106.0  # 1R touched in the first block, which has no exit
+    lows[100] = 94.0  # SL hit in the next block
+    assert _scan_exit(highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, True, False) == (100, 95.0, "sl", 95.0, True)
+    lows[100] = 99.0
+    highs[100] = 111.0  # TP hit instead
+    assert _scan_exit(highs, lows, 1, True, 100.0, 95.0, 110.0, 5.0, True, False) == (100, 110.0, "tp", 95.0, True)
+
+    # Same answers as walking every bar
+    for sl_bar in (100, 250):
+        highs = np.full(300, 101.0)
+        lows = np.full(300, 99.0)
+        lows[30] = 94.0
+        highs[sl_bar] = 106.0
+        args = (highs, lows, 1, False, 100.0, 105.0, 90.0, 5.0, True, False)
+        blocked = _scan_exit(*args)
+        monkeypatch.setattr(backtester, "_SCAN_LOOP_BARS", 10**9)
+        assert blocked == _scan_exit(*args) == (sl_bar, 105.0, "sl", 105.0, True)
+        monkeypatch.undo()
+
+
+def test_scan_exit_end_of_data_returns_none_price():
+    highs = np.array([100.0, 101.0, 102.0])
+    lows = np.array([100.0, 99.0, 98.0])
+    assert _scan_exit(highs, lows, 1, False, 100.0, 105.0, 90.0, 5.0, False, False) == (2, None, "end_of_data", 105.0, False)
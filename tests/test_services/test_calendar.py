@@ -1,9 +1,11 @@
 """Tests for economic calendar service."""
 
+import time
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch, MagicMock
 
 import httpx
+import orjson
 import pytest
 
 from app.services.calendar import CalendarService, INSTRUMENT_COUNTRIES
@@ -143,6 +145,150 @@ class TestCalendarService:
         assert result["score"] == -2
 
 
+    @pytest.mark.asyncio
+    async def test_refreshes_reuse_one_client(self):
+        """Expired-cache refetches should go through the same HTTP client."""
+        service = CalendarService()
+        mock_resp = MagicMock()
+        mock_resp.content = b"[]"
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(return_value=mock_resp)
+            mock_client.return_value.aclose = AsyncMock()
+            await service._fetch_events()
+            service._cache = ([], 0)  # expire
+            await service._fetch_events()
+            await service.aclose()
+
+        assert mock_client.call_count == 1
+        assert mock_client.return_value.get.await_count == 2
+        mock_client.return_value.aclose.assert_awaited_once()
+
+
+    @pytest.mark.asyncio
+    async def test_events_parsed_once_per_fetched_list(self):
+        """Repeated queries against the same cached list shouldn't re-parse event times."""
+        service = CalendarService()
+        events = [_make_event("NFP", "USD", "High", 2), _make_event("ECB", "EUR", "High", 6)]
+
+        with patch.object(service, "_fetch_events", return_value=events), \
+                patch.object(CalendarService, "_parse_event_time", wraps=CalendarService._parse_event_time) as spy:
+            first = await service.get_calendar_risk("EURUSD")
+            second = await service.get_calendar_risk("XAUUSD")
+
+        assert spy.call_count == 2
+        assert [e["title"] for e in first["events"]] == ["NFP", "ECB"]
+        assert [e["title"] for e in second["events"]] == ["NFP"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Callers that miss the cache together should wait on a single request."""
+        import asyncio
+
+        service = CalendarService()
+        events = [_make_event("NFP", "USD", "High", 2)]
+        mock_resp = MagicMock()
+        mock_resp.content = orjson.dumps(events)
+
+        async def slow_get(url):
+            await asyncio.sleep(0.01)
+            return mock_resp
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=slow_get)
+            results = await asyncio.gather(
+                service.get_calendar_risk("XAUUSD"),
+                service.get_calendar_risk("EURUSD"),
+                service.get_calendar_risk("MES"),
+            )
+
+        assert mock_client.return_value.get.await_count == 1
+        assert [r["score"] for r in results] == [-2, -2, -2]
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_inflight_fetch(self):
+        """Closing should stop a pending fetch before its client is closed."""
+        import asyncio
+
+        service = CalendarService()
+        started = asyncio.Event()
+
+        async def hanging_get(url):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=hanging_get)
+            mock_client.return_value.aclose = AsyncMock()
+            caller = asyncio.ensure_future(service._fetch_events())
+            await started.wait()
+            inflight = service._inflight
+            await service.aclose()
+
+        assert inflight.cancelled()
+        assert service._inflight is None
+        mock_client.return_value.aclose.assert_awaited_once()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_survives_restart(self, tmp_path):
+        """A fresh service should reuse the last fetch persisted to disk."""
+        cache_path = tmp_path / "calendar.json"
+        events = [_make_event("NFP", "USD", "High", 2)]
+        mock_resp = MagicMock()
+        mock_resp.content = orjson.dumps(events)
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(return_value=mock_resp)
+            await CalendarService(cache_path=cache_path)._fetch_events()
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=Exception("should not fetch"))
+            result = await CalendarService(cache_path=cache_path).get_calendar_risk("XAUUSD")
+
+        assert result["score"] == -2
+        assert not (tmp_path / "calendar.json.tmp").exists()
+
+    @pytest.mark.asyncio
+    async def test_expired_disk_cache_is_stale_fallback(self, tmp_path):
+        """An expired file should trigger a refetch but still cover an outage."""
+        cache_path = tmp_path / "calendar.json"
+        events = [_make_event("NFP", "USD", "High", 2)]
+        cache_path.write_bytes(orjson.dumps({"ts": time.time() - 7200, "events": events}))
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=httpx.ConnectError("down"))
+            result = await CalendarService(cache_path=cache_path).get_calendar_risk("XAUUSD")
+
+        mock_client.return_value.get.assert_awaited_once()
+        assert result["score"] == -2
+
+    @pytest.mark.asyncio
+    async def test_background_refresher_renews_before_expiry(self):
+        """start() should keep the cache fresh without a caller paying for the fetch."""
+        import asyncio
+
+        service = CalendarService()
+        service._cache_ttl = 0.05
+        mock_resp = MagicMock()
+        mock_resp.content = b"[]"
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.get = AsyncMock(return_value=mock_resp)
+            mock_client.return_value.aclose = AsyncMock()
+            service.start()
+            await asyncio.sleep(0.12)
+            fetched = mock_client.return_value.get.await_count
+            _, ts = service._cache
+            await service.aclose()
+
+        # Initial fetch plus refreshes at 80% of the TTL
+        assert fetched >= 2
+        assert time.monotonic() - ts < service._cache_ttl
+        assert service._refresher_task is None
+
+
 class TestInstrumentCountries:
     def test_all_instruments_mapped(self):
         """All instruments should have country mappings."""
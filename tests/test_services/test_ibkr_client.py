@@ -3,6 +3,9 @@ IBKR client tests are limited to unit-level checks since the actual
 ib_async library requires a running IB Gateway. Integration tests
 should be run manually with paper trading.
 """
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
 from app.services.ibkr_client import IBKRClient
@@ -25,3 +28,134 @@ def test_gold_contract_raises_before_connect(settings):
     client = IBKRClient(settings)
     with pytest.raises(RuntimeError, match="not qualified"):
         _ = client.gold_contract
+
+
+@pytest.mark.asyncio
+async def test_get_price_reuses_streaming_subscription(settings):
+    client = IBKRClient(settings)
+    client._ib = MagicMock()
+    client._ib.isConnected.return_value = True
+    client._contracts["XAUUSD"] = MagicMock()
+    client._ib.reqMktData.return_value = SimpleNamespace(bid=2900.0, ask=2900.5, last=float("nan"))
+
+    first = await client.get_price("XAUUSD")
+    second = await client.get_price("XAUUSD")
+
+    assert first == second == {"bid": 2900.0, "ask": 2900.5, "last": 2900.25}
+    client._ib.reqMktData.assert_called_once()
+    client._ib.cancelMktData.assert_not_called()
+
+
+class _FakeEvent:
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def emit(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_fill_returns_on_status_event(settings):
+    import asyncio
+
+    client = IBKRClient(settings)
+    trade = SimpleNamespace(orderStatus=SimpleNamespace(status="Submitted"), statusEvent=_FakeEvent())
+
+    def fill():
+        trade.orderStatus.status = "Filled"
+        trade.statusEvent.emit(trade)
+
+    asyncio.get_running_loop().call_later(0.01, fill)
+    await asyncio.wait_for(client._wait_for_fill(trade, timeout=5.0), 1.0)
+
+    assert trade.statusEvent.handlers == []
+
+
+@pytest.mark.asyncio
+async def test_wait_for_fill_times_out(settings):
+    client = IBKRClient(settings)
+    trade = SimpleNamespace(orderStatus=SimpleNamespace(status="Submitted"), statusEvent=_FakeEvent())
+
+    await client._wait_for_fill(trade, timeout=0.01)
+
+    assert trade.statusEvent.handlers == []
+
+
+@pytest.mark.asyncio
+async def test_connect_qualifies_contracts_concurrently(settings):
+    import asyncio
+
+    client = IBKRClient(settings)
+    client._ib = MagicMock()
+    client._ib.connectAsync = AsyncMock()
+    in_flight = peak = 0
+
+    async def qualify(raw):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if raw.symbol == "XAUUSD":
+            raise RuntimeError("no security definition")
+        return [SimpleNamespace(conId=1, symbol=raw.symbol, secType=raw.secType, currency=raw.currency)]
+
+    client._ib.qualifyContractsAsync = qualify
+    await client.connect()
+
+    assert peak > 1
+    assert client._contracts
+    assert "XAUUSD" not in client._contracts
+    assert set(client._tickers) == set(client._contracts)
+
+
+@pytest.mark.asyncio
+async def test_resolve_instrument_key_uses_connect_index(settings):
+    client = IBKRClient(settings)
+    client._ib = MagicMock()
+    client._ib.connectAsync = AsyncMock()
+
+    async def qualify(raw):
+        return [SimpleNamespace(conId=1, symbol=raw.symbol, secType=raw.secType, currency=raw.currency)]
+
+    client._ib.qualifyContractsAsync = qualify
+    await client.connect()
+
+    assert client._resolve_instrument_key(SimpleNamespace(symbol="EUR", secType="CASH", currency="JPY")) == "EURJPY"
+    assert client._resolve_instrument_key(SimpleNamespace(symbol="EUR", secType="CASH", currency="USD")) == "EURUSD"
+    # Unqualified currency falls back to the first instrument with that symbol
+    assert client._resolve_instrument_key(SimpleNamespace(symbol="EUR", secType="CASH", currency="GBP")) == "EURUSD"
+    assert client._resolve_instrument_key(SimpleNamespace(symbol="ZZZ", secType="STK", currency="USD")) is None
+
+
+@pytest.mark.asyncio
+async def test_account_info_served_from_account_value_events(settings):
+    def value(tag, amount, currency="USD"):
+        return SimpleNamespace(account="DU1", tag=tag, value=str(amount), currency=currency, modelCode="")
+
+    client = IBKRClient(settings)
+    client._ib = MagicMock()
+    client._ib.isConnected.return_value = True
+    client._ib.managedAccounts.return_value = ["DU1"]
+    client._ib.accountValues.return_value = [
+        value("NetLiquidation", 1000), value("NetLiquidation", 900, "EUR"), value("Cushion", 0.5),
+    ]
+
+    assert await client.get_account_info() == {"NetLiquidation": 1000.0, "accounts": ["DU1"]}
+
+    client._on_account_value(value("NetLiquidation", 1100))
+    client._on_account_value(value("NetLiquidation", 990, "EUR"))
+    client._on_account_value(value("AvailableFunds", 500))
+    info = await client.get_account_info()
+
+    assert info == {"NetLiquidation": 1100.0, "AvailableFunds": 500.0, "accounts": ["DU1"]}
+    client._ib.accountValues.assert_called_once()
@@ -79,6 +79,16 @@ def test_futures_expiry_format():
     assert month in (3, 6, 9, 12)  # HMUZ cycle
 
 
+def test_futures_expiry_rolls_near_contract_month():
+    from datetime import date
+
+    from app.instruments import _next_expiry_for_cycle
+
+    assert _next_expiry_for_cycle("HMUZ", date(2025, 3, 5).toordinal()) == "202503"
+    assert _next_expiry_for_cycle("HMUZ", date(2025, 3, 12).toordinal()) == "202506"
+    assert _next_expiry_for_cycle("HMUZ", date(2025, 12, 20).toordinal()) == "202603"
+
+
 def test_futures_expiry_no_cycle_raises():
     spec = INSTRUMENTS["XAUUSD"]
     with pytest.raises(ValueError, match="no future_cycle"):
@@ -126,3 +136,18 @@ def test_instrument_spec_fields():
         assert spec.display_name
         assert spec.yahoo_symbol
         assert spec.size_unit
+
+
+def test_session_hours_mask_handles_midnight_wrap():
+    from app.instruments import TradingSession
+
+    session = TradingSession("Overnight", 22, 6)
+    assert [h for h in range(24) if (session.hours_mask >> h) & 1] == [0, 1, 2, 3, 4, 5, 22, 23]
+
+
+def test_in_session_hour_matches_sessions():
+    spec = INSTRUMENTS["XAUUSD"]  # London 7-16, New York 13-21
+    assert not spec.in_session_hour(6)
+    assert spec.in_session_hour(7)
+    assert spec.in_session_hour(20)
+    assert not spec.in_session_hour(21)
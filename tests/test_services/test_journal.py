@@ -115,6 +115,17 @@ class TestJournalService:
         assert len(entries) == 1
         assert entries[0].instrument == "XAUUSD"
 
+    @pytest.mark.asyncio
+    async def test_stream_journal_filter_by_instrument(self, db_session, journal_service):
+        """Streaming should apply the same filters as get_journal."""
+        await journal_service.record_analysis(db_session, _sample_analysis(instrument="XAUUSD"))
+        await journal_service.record_analysis(db_session, _sample_analysis(instrument="MES"))
+        await journal_service.record_analysis(db_session, _sample_analysis(instrument="XAUUSD"))
+
+        entries = [e async for e in journal_service.stream_journal(db_session, instrument="XAUUSD", batch_size=1)]
+        assert len(entries) == 2
+        assert all(e.instrument == "XAUUSD" for e in entries)
+
     @pytest.mark.asyncio
     async def test_get_journal_stats_empty(self, db_session, journal_service):
         """Empty journal should return zero stats."""
@@ -173,11 +184,16 @@ class TestJournalService:
 
     @pytest.mark.asyncio
     async def test_factors_serialized_as_json(self, db_session, journal_service):
-        """Factors should be stored as JSON string."""
+        """Factors should be stored as JSON text and loaded back as a dict."""
         data = _sample_analysis()
         entry = await journal_service.record_analysis(db_session, data)
 
-        assert entry.factors is not None
+        assert entry.factors["d1_trend"] == 2
+        assert entry.trade_idea["stop_distance"] == 45
+
+        from sqlalchemy import text
+        raw = await db_session.execute(
+            text("SELECT factors FROM analysis_journal WHERE id = :id"), {"id": entry.id}
+        )
         import json
-        factors = json.loads(entry.factors)
-        assert factors["d1_trend"] == 2
+        assert json.loads(raw.scalar())["d1_trend"] == 2